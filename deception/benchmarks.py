@@ -0,0 +1,276 @@
+"""
+Benchmarks for the experiment pipeline, run offline against FakeAgent.
+
+    python benchmarks.py                        # run everything, write benchmark_results.json
+    python benchmarks.py --only random_baseline fake_agent
+    python benchmarks.py --save-baseline        # also store the run as the new baseline
+    python benchmarks.py --checkpoint-sizes 1000 100000
+
+Every benchmark reports one or more named measurements with a unit. Results
+are written as JSON and compared against the saved baseline; measurements
+that got worse by more than --tolerance are flagged as regressions and make
+the command exit with status 1.
+"""
+import argparse
+from contextlib import redirect_stdout
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+# Progress bars would dominate the output and cost time in the hot loops.
+os.environ.setdefault('TQDM_DISABLE', '1')
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Higher is better for these units; everything else is a duration.
+THROUGHPUT_UNITS = {'games/s'}
+
+# Durations that moved by less than this are timer noise, not regressions.
+NOISE_FLOOR_SECONDS = 0.005
+
+CLI_COMMANDS = ['', 'run', 'replay', 'grid', 'analyze', 'plot', 'compare', 'status']
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+def best_of(repeat, fn, *args, **kwargs):
+    return min(timed(fn, *args, **kwargs) for _ in range(repeat))
+
+def fresh_run(main, unique_str):
+    shutil.rmtree(os.path.join(main.DATA_FOLDER, unique_str), ignore_errors=True)
+    return unique_str
+
+def bench_random_baseline(main, args):
+    random.seed(0)
+    results = {}
+    seconds = timed(main.run_control_experiment, args.games, fresh_run(main, 'bench_baseline'))
+    results['random_baseline'] = (args.games / seconds, 'games/s')
+    seconds = timed(main.run_vectorized_control_experiment, args.games, fresh_run(main, 'bench_vectorized'), seed=0)
+    results['random_baseline_vectorized'] = (args.games / seconds, 'games/s')
+    seconds = timed(main.run_sharded_control_experiment, args.games, fresh_run(main, 'bench_sharded'), seed=0)
+    results['random_baseline_sharded'] = (args.games / seconds, 'games/s')
+    return results
+
+def bench_fake_agent(main, args):
+    from pyfiles.fake_agent import FakeAgent
+    from pyfiles.prompt import ZERO_SHOT_PROMPT
+    from pyfiles.rate_limit import RateLimiter
+
+    results = {}
+    for name, concurrency in (('fake_agent', None), ('fake_agent_async', 16)):
+        agent = FakeAgent(latency=args.latency, seed=0, error_rate=args.error_rate)
+        rate_limiter = RateLimiter(base_delay=args.latency, max_delay=args.latency * 10, seed=0)
+        seconds = timed(main.run_agent_experiment, args.agent_games, fresh_run(main, f'bench_{name}'), agent, ZERO_SHOT_PROMPT,
+                        concurrency=concurrency, rate_limiter=rate_limiter, control='bench_baseline')
+        results[name] = (args.agent_games / seconds, 'games/s')
+    return results
+
+def play_games(num_games):
+    from deception.environments.compact_blackjack import CompactBlackjack
+    from pyfiles.utils import random_draw_card
+    return [CompactBlackjack(random_draw_card).play() for _ in range(num_games)]
+
+def bench_checkpoint(main, args):
+    """
+    For each size, a journal holding that many games is built, then one more
+    100-game checkpoint is timed (the per-checkpoint cost during a run at
+    that size) along with reopening the journal to resume.
+    """
+    from pyfiles.checkpoint import CheckpointJournal
+
+    results = {}
+    for size in args.checkpoint_sizes:
+        unique_str = fresh_run(main, f'bench_checkpoint_{size}')
+        os.makedirs(os.path.join(main.DATA_FOLDER, unique_str))
+        journal = CheckpointJournal(os.path.join(main.DATA_FOLDER, unique_str, f'{unique_str}_checkpoint.journal'))
+        random.seed(0)
+        for start in range(0, size, 10000):
+            games = play_games(min(10000, size - start))
+            journal.append(games)
+
+        seconds = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            main.write_checkpoint(journal, games[:100])
+            seconds.append(time.perf_counter() - start)
+        results[f'checkpoint_write_{size}'] = (min(seconds), 's')
+        results[f'checkpoint_resume_{size}'] = (best_of(args.repeat, main.open_checkpoint, unique_str), 's')
+        shutil.rmtree(os.path.join(main.DATA_FOLDER, unique_str))
+    return results
+
+def bench_analysis(main, args):
+    from pyfiles import statistical_analysis
+
+    control_df, experiment_df = main.load_and_parse_data(
+        os.path.join(main.DATA_FOLDER, 'bench_baseline', 'bench_baseline_game_results.csv'),
+        os.path.join(main.DATA_FOLDER, 'bench_vectorized', 'bench_vectorized_game_results.csv'),
+    )
+    prepared = {feature: statistical_analysis.prepare_feature(control_df, experiment_df, feature) for feature in statistical_analysis.FEATURES}
+
+    results = {'analysis_prepare_features': (best_of(args.repeat, lambda: [
+        statistical_analysis.prepare_feature(control_df, experiment_df, feature) for feature in statistical_analysis.FEATURES]), 's')}
+    for test_name, test_fn in statistical_analysis.TESTS.items():
+        def run_test():
+            for feature_data in prepared.values():
+                try:
+                    test_fn(feature_data)
+                except ValueError:
+                    pass
+        results[f"analysis_{test_name.lower().replace(' ', '_')}"] = (best_of(args.repeat, run_test), 's')
+    results['analysis_run_analysis'] = (best_of(args.repeat, statistical_analysis.run_analysis, control_df, experiment_df), 's')
+    return results
+
+def bench_plots(main, args):
+    timed(main.create_plots, 'bench_baseline')  # imports matplotlib and seaborn outside the timing
+    return {'plot_create_plots': (best_of(args.repeat, main.create_plots, 'bench_baseline'), 's')}
+
+def bench_cli(main, args):
+    """Wall time of `cli.py <command> --help` in a fresh interpreter."""
+    results = {}
+    for command in CLI_COMMANDS:
+        argv = [sys.executable, os.path.join(HERE, 'cli.py'), *([command] if command else []), '--help']
+        seconds = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            subprocess.run(argv, cwd=HERE, stdout=subprocess.DEVNULL, check=True)
+            seconds.append(time.perf_counter() - start)
+        results[f"cli_startup_{command or 'help'}"] = (min(seconds), 's')
+    argv = [sys.executable, '-c', 'import main']
+    results['cli_import_main'] = (min(timed(subprocess.run, argv, cwd=HERE, check=True) for _ in range(args.repeat)), 's')
+    return results
+
+# Order matters: analysis and plots read the results written by random_baseline.
+BENCHMARKS = {
+    'random_baseline': bench_random_baseline,
+    'fake_agent': bench_fake_agent,
+    'checkpoint': bench_checkpoint,
+    'analysis': bench_analysis,
+    'plots': bench_plots,
+    'cli': bench_cli,
+}
+
+def run_benchmarks(args):
+    import main
+    main.DATA_FOLDER = args.data_folder
+
+    selected = args.only or list(BENCHMARKS)
+    if {'analysis', 'plots'} & set(selected) and 'random_baseline' not in selected:
+        selected.insert(0, 'random_baseline')
+
+    measurements = {}
+    for name in BENCHMARKS:
+        if name in selected:
+            print(f"[bench] {name}", flush=True)
+            for key, (value, unit) in BENCHMARKS[name](main, args).items():
+                measurements[key] = {'value': value, 'unit': unit}
+                print(f"    {key}: {value:.4g} {unit}", flush=True)
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'commit': git_commit(),
+            'games': args.games,
+            'agent_games': args.agent_games,
+        },
+        'measurements': measurements,
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(current, baseline, tolerance):
+    """
+    Returns one row per measurement present in both runs. `change` is the
+    relative slowdown (positive is worse) whatever the unit, and rows worse
+    than `tolerance` are marked as regressions, unless they are durations
+    that moved by less than NOISE_FLOOR_SECONDS.
+    """
+    rows = []
+    for key, measurement in current['measurements'].items():
+        if key not in baseline['measurements']:
+            continue
+        old, new = baseline['measurements'][key]['value'], measurement['value']
+        if measurement['unit'] in THROUGHPUT_UNITS:
+            change = old / new - 1 if new else float('inf')
+            regression = change > tolerance
+        else:
+            change = new / old - 1 if old else 0.0
+            regression = change > tolerance and new - old > NOISE_FLOOR_SECONDS
+        rows.append({'name': key, 'baseline': old, 'current': new, 'unit': measurement['unit'],
+                     'change': change, 'regression': regression})
+    return rows
+
+def print_comparison(rows):
+    print(f"{'measurement':<36}{'baseline':>12}{'current':>12}  {'unit':<8}{'change':>9}")
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        print(f"{row['name']:<36}{row['baseline']:>12.4g}{row['current']:>12.4g}  {row['unit']:<8}{row['change']:>+8.1%}{flag}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the blackjack experiment pipeline")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument('--games', type=int, default=10000, help="games for the random baseline")
+    parser.add_argument('--agent-games', type=int, default=200, help="games for the fake agent runs")
+    parser.add_argument('--latency', type=float, default=0.001, help="fake agent latency per call, seconds")
+    parser.add_argument('--error-rate', type=float, default=0.05, help="share of fake agent calls that fail with a 429")
+    parser.add_argument('--checkpoint-sizes', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=3, help="repetitions for the short benchmarks; the best is kept")
+    parser.add_argument('--data-folder', default=None, help="scratch folder for benchmark runs (default: a temporary directory)")
+    parser.add_argument('--output', default=os.path.join(HERE, 'benchmark_results.json'))
+    parser.add_argument('--baseline', default=os.path.join(HERE, 'benchmark_baseline.json'))
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="relative slowdown flagged as a regression")
+    return parser
+
+def bench(argv=None):
+    args = build_parser().parse_args(argv)
+    scratch = None
+    if args.data_folder is None:
+        args.data_folder = scratch = tempfile.mkdtemp(prefix='blackjack_bench_')
+
+    try:
+        current = run_benchmarks(args)
+    finally:
+        if scratch is not None:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    with open(args.output, 'w') as f:
+        json.dump(current, f, indent=4)
+    print(f"Results written to {args.output}")
+
+    regressions = []
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(current, baseline, args.tolerance)
+        print_comparison(rows)
+        regressions = [row['name'] for row in rows if row['regression']]
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.tolerance:.0%}: {', '.join(regressions)}")
+
+    if args.save_baseline:
+        shutil.copyfile(args.output, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(bench())
@@ -0,0 +1,181 @@
+"""
+Command-line entry point for the blackjack experiments.
+
+    python cli.py run baseline --games 1000
+    python cli.py run baseline --games 1000000 --workers 8 --seed 0
+    python cli.py run gpt_0.0_zero_shot --model gpt_0 --prompt zero_shot --concurrency 16
+    python cli.py replay gpt_0.0_zero_shot gpt_0.0_zero_shot_replay
+    python cli.py analyze gpt_0.0_zero_shot --control baseline
+    python cli.py analyze gpt_0.0_zero_shot --exact
+    python cli.py plot gpt_0.0_zero_shot
+    python cli.py compare --mode all
+    python cli.py status gpt_0.0_zero_shot
+    python -m deception.cli run baseline --games 1000   # from the repository root
+
+Each command imports main (and through it pandas, and matplotlib/scipy once
+they are used) only when it runs, so --help returns immediately and the
+random baseline never touches the LLM clients or API keys.
+"""
+import argparse
+import os
+import sys
+
+# main and pyfiles are imported from this folder and the environments
+# through the deception package, so both roots must be importable whether
+# this runs as `python cli.py` or `python -m deception.cli`.
+HERE = os.path.dirname(os.path.abspath(__file__))
+for path in (os.path.dirname(HERE), HERE):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+PROMPTS = {
+    'zero_shot': 'ZERO_SHOT_PROMPT',
+    'few_shot': 'FEW_SHOT_PROMPT',
+}
+
+def load_main(args):
+    import main
+    main.DATA_FOLDER = args.data_folder
+    return main
+
+def results_file(name):
+    return os.path.join(name, f'{name}_game_results.csv')
+
+def run(args):
+    main = load_main(args)
+
+    if args.model == 'random':
+        if args.workers:
+            main.run_sharded_control_experiment(args.games, args.name, seed=args.seed, max_workers=args.workers)
+        elif args.vectorized:
+            main.run_vectorized_control_experiment(args.games, args.name, seed=args.seed)
+        else:
+            main.run_control_experiment(args.games, args.name)
+        return
+
+    from pyfiles import prompt as prompts
+    from pyfiles.agent import get_agent
+
+    agent = get_agent(f"agent_{args.model}")
+    if args.cards_per_call > 1:
+        prompt = prompts.multi_card_prompt(args.cards_per_call)
+    else:
+        prompt = getattr(prompts, PROMPTS[args.prompt])
+
+    main.run_agent_experiment(
+        args.games, args.name, agent, prompt,
+        concurrency=args.concurrency,
+        early_stopping=args.early_stopping,
+        state_encoding=args.state_encoding,
+        profile=args.profile,
+        cards_per_call=args.cards_per_call,
+        stream=args.stream,
+    )
+
+def replay(args):
+    main = load_main(args)
+    main.run_replay_experiment(args.source, args.name, strict=args.strict)
+
+def run_grid(args):
+    main = load_main(args)
+    main.run_experiment_grid(args.games, control=args.control, concurrency=args.concurrency)
+
+def analyze(args):
+    main = load_main(args)
+    for name in args.experiments:
+        if args.exact:
+            main.run_exact_analysis(results_file(name), name)
+        elif args.bootstrap:
+            main.run_bootstrap_analysis(results_file(args.control), results_file(name), name, num_resamples=args.resamples, seed=args.seed)
+        else:
+            main.run_statistical_analysis(results_file(args.control), results_file(name), name)
+
+def plot(args):
+    main = load_main(args)
+    for name in args.experiments:
+        main.create_plots(name)
+    if args.groups:
+        main.render_plots(main.EXPERIMENT_FILES, main.PLOT_GROUPS, max_workers=args.workers)
+
+def compare(args):
+    main = load_main(args)
+    main.run_comparison_matrix(main.EXPERIMENT_FILES, mode=args.mode, max_workers=args.workers)
+
+def status(args):
+    import json
+    path = os.path.join(args.data_folder, args.name, f'{args.name}_live_summary.json')
+    with open(path) as f:
+        summary = json.load(f)
+    for key, value in summary.items():
+        if not isinstance(value, dict):
+            print(f"{key}: {value}")
+
+def build_parser():
+    from pyfiles.agent import MODEL_REGISTRY
+
+    parser = argparse.ArgumentParser(description="LLM blackjack dealer experiments")
+    parser.add_argument('--data-folder', default='results', help="folder holding one subfolder per experiment")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="play games and save the results")
+    run_parser.add_argument('name', help="experiment name, also its results folder")
+    run_parser.add_argument('--games', type=int, default=1000)
+    run_parser.add_argument('--model', default='random', choices=['random'] + [name[len('agent_'):] for name in MODEL_REGISTRY],
+                            help="'random' for the control baseline, otherwise an agent from MODEL_REGISTRY")
+    run_parser.add_argument('--prompt', default='zero_shot', choices=list(PROMPTS))
+    run_parser.add_argument('--concurrency', type=int, default=None, help="games in flight at once (async)")
+    run_parser.add_argument('--state-encoding', default='pretty', choices=['pretty', 'compact'])
+    run_parser.add_argument('--cards-per-call', type=int, default=1)
+    run_parser.add_argument('--stream', action='store_true', help="stop reading each answer once its card is parsed")
+    run_parser.add_argument('--early-stopping', action='store_true')
+    run_parser.add_argument('--profile', action='store_true', help="write a cProfile dump of the run")
+    run_parser.add_argument('--vectorized', action='store_true', help="simulate the random baseline with NumPy")
+    run_parser.add_argument('--workers', type=int, default=None,
+                            help="play the random baseline in reproducible shards across this many processes")
+    run_parser.add_argument('--seed', type=int, default=None)
+    run_parser.set_defaults(func=run)
+
+    replay_parser = commands.add_parser('replay', help="replay a recorded run offline with the current game code and parser")
+    replay_parser.add_argument('source', help="experiment whose transcript is replayed")
+    replay_parser.add_argument('name', help="experiment name for the replayed results")
+    replay_parser.add_argument('--strict', action='store_true', help="fail when a game reaches a state that was not recorded")
+    replay_parser.set_defaults(func=replay)
+
+    grid_parser = commands.add_parser('grid', help="run the whole EXPERIMENT_GRID with analysis and plots")
+    grid_parser.add_argument('--games', type=int, default=1000)
+    grid_parser.add_argument('--control', default='baseline')
+    grid_parser.add_argument('--concurrency', type=int, default=None)
+    grid_parser.set_defaults(func=run_grid)
+
+    analyze_parser = commands.add_parser('analyze', help="compare experiments against the control run")
+    analyze_parser.add_argument('experiments', nargs='+')
+    analyze_parser.add_argument('--control', default='baseline')
+    analyze_parser.add_argument('--bootstrap', action='store_true', help="bootstrap CIs and permutation p-values")
+    analyze_parser.add_argument('--exact', action='store_true', help="test against the exact random-control distributions instead of --control")
+    analyze_parser.add_argument('--resamples', type=int, default=10000)
+    analyze_parser.add_argument('--seed', type=int, default=None)
+    analyze_parser.set_defaults(func=analyze)
+
+    plot_parser = commands.add_parser('plot', help="render per-experiment and combined plots")
+    plot_parser.add_argument('experiments', nargs='*')
+    plot_parser.add_argument('--groups', action='store_true', help="also render the PLOT_GROUPS combined plots")
+    plot_parser.add_argument('--workers', type=int, default=None)
+    plot_parser.set_defaults(func=plot)
+
+    compare_parser = commands.add_parser('compare', help="pairwise comparison matrix across EXPERIMENT_FILES")
+    compare_parser.add_argument('--mode', default='baseline', choices=['baseline', 'all'])
+    compare_parser.add_argument('--workers', type=int, default=None)
+    compare_parser.set_defaults(func=compare)
+
+    status_parser = commands.add_parser('status', help="print the live summary of a running or finished experiment")
+    status_parser.add_argument('name')
+    status_parser.set_defaults(func=status)
+
+    return parser
+
+def cli(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    cli()
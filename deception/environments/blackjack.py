@@ -1,7 +1,10 @@
 from collections import Counter
-from deception.pyfiles.agent import parse_response
+from pyfiles.framework import ControlledMechanic, Environment
 import json
 
+CARDS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king', 'ace']
+CARD_VALUES = (2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11)
+
 class Player():
     def __init__(self, deck):
         self.deck = deck
@@ -24,11 +27,31 @@ class Deck():
         self.cards = []
     
     def draw_card(self, game_state):
+        if self.cards:
+            return self.cards.pop(0)
         is_valid, card = False, None
         i = 0
         while not is_valid and i < 5:
             is_valid, card = self.draw_card_fn(game_state)
             i += 1
+        return self.take(card)
+
+    async def adraw_card(self, game_state):
+        if self.cards:
+            return self.cards.pop(0)
+        is_valid, card = False, None
+        i = 0
+        while not is_valid and i < 5:
+            is_valid, card = await self.draw_card_fn(game_state)
+            i += 1
+        return self.take(card)
+
+    def take(self, card):
+        # Multi-card draw functions answer with a list of upcoming cards;
+        # the first is dealt now and the rest serve the next draws.
+        if isinstance(card, list):
+            self.cards.extend(card[1:])
+            return card[0]
         return card
     
     def card_value(self, card):
@@ -57,19 +80,28 @@ class Blackjack():
         self.dealer = Dealer(self.deck)
         self.is_dealer_turn = False
 
+    def _hit(self, player):
+        card = yield self.game_state()
+        player.hand.append(card)
+
     def deal_cards(self):
-        self.player.hit(self.game_state())
-        self.player.hit(self.game_state())
+        yield from self._hit(self.player)
+        yield from self._hit(self.player)
 
         self.is_dealer_turn = True
         
-        self.dealer.hit(self.game_state())
-        self.dealer.hit(self.game_state())
+        yield from self._hit(self.dealer)
+        yield from self._hit(self.dealer)
 
         self.is_dealer_turn = False
-    
-    def play(self):
-        self.deal_cards()
+
+    def turns(self):
+        """
+        Generator over a single game. Yields the game state every time a card
+        is needed and expects the drawn card to be sent back in; the result
+        dict is returned through StopIteration once the game is over.
+        """
+        yield from self.deal_cards()
 
         player_hand_value = self.player.hand_value()
         dealer_upcard = self.deck.card_value(self.dealer.hand[0])
@@ -77,13 +109,13 @@ class Blackjack():
         while True:
             if dealer_upcard >= 7:
                 if player_hand_value < 17:
-                    self.player.hit(self.game_state())
+                    yield from self._hit(self.player)
                     player_hand_value = self.player.hand_value()
                 else:
                     break
             elif dealer_upcard <= 6:
                 if player_hand_value < 12:
-                    self.player.hit(self.game_state())
+                    yield from self._hit(self.player)
                     player_hand_value = self.player.hand_value()
                 else:
                     break
@@ -108,7 +140,7 @@ class Blackjack():
         self.is_dealer_turn = True
 
         while self.dealer.hand_value() < 17:
-            self.dealer.hit(self.game_state())
+            yield from self._hit(self.dealer)
 
         dealer_value = self.dealer.hand_value()
 
@@ -133,6 +165,25 @@ class Blackjack():
             'dealer_hand': Counter(self.dealer.hand)
         }
 
+    def play(self):
+        turns = self.turns()
+        try:
+            game_state = next(turns)
+            while True:
+                game_state = turns.send(self.deck.draw_card(game_state))
+        except StopIteration as stop:
+            return stop.value
+
+    async def aplay(self):
+        """Same as play, but awaits an async draw_card_fn for every card."""
+        turns = self.turns()
+        try:
+            game_state = next(turns)
+            while True:
+                game_state = turns.send(await self.deck.adraw_card(game_state))
+        except StopIteration as stop:
+            return stop.value
+
     def game_state(self):
         return json.dumps(
             {
@@ -143,4 +194,52 @@ class Blackjack():
                 "dealer_hand_value": self.dealer.hand_value(),
             },
             indent=4
-        )
\ No newline at end of file
+        )
+
+class DrawCardMechanic(ControlledMechanic):
+    def get_options(self, state):
+        return CARDS
+
+    def execute_action(self, state, action):
+        return {**state, "drawn_card": action}
+
+class BlackjackEnvironment(Environment):
+    """
+    Blackjack exposed through the framework API so several games can be
+    stepped in lockstep by a VectorEnvironment. Every step resolves one card
+    draw; unparseable draws (None) are retried up to 5 times like Deck.draw_card.
+    """
+    def __init__(self):
+        super().__init__()
+        self.controlled_mechanics["draw_card"] = DrawCardMechanic()
+
+    def reset(self):
+        self.game = Blackjack(None)
+        self.turns = self.game.turns()
+        self.attempts = 0
+        self.result = None
+        self.pending_state = next(self.turns)
+        return self.get_state()
+
+    def step(self, action):
+        card = action["drawn_card"]
+        self.attempts += 1
+        if card is None and self.attempts < 5:
+            return self.get_state(), 0.0, False, {"retry": self.attempts}
+
+        self.attempts = 0
+        try:
+            self.pending_state = self.turns.send(card)
+        except StopIteration as stop:
+            self.pending_state = None
+            self.result = stop.value
+        return self.get_state(), 0.0, self.is_over(), {}
+
+    def get_state(self):
+        return {"game_state": self.pending_state}
+
+    def is_over(self):
+        return self.result is not None
+
+    def get_result(self):
+        return self.result
@@ -0,0 +1,169 @@
+from collections import Counter
+import json
+from deception.environments.blackjack import CARDS, CARD_VALUES
+
+CARD_CODES = {card: code for code, card in enumerate(CARDS)}
+ACE = CARD_CODES['ace']
+
+class GameStateView():
+    """
+    Snapshot of the game at one draw. It renders to the same JSON as
+    Blackjack.game_state, but only when it is formatted or str()-ed, so draw
+    functions that ignore the state never pay for json.dumps.
+    """
+    __slots__ = ('is_dealer_turn', 'player_cards', 'player_value', 'dealer_cards', 'dealer_value')
+
+    def __init__(self, game):
+        self.is_dealer_turn = game.is_dealer_turn
+        self.player_cards = tuple(game.player.cards)
+        self.player_value = game.player.value
+        self.dealer_cards = tuple(game.dealer.cards)
+        self.dealer_value = game.dealer.value
+
+    def to_dict(self):
+        return {
+            "drawing_for": "dealer" if self.is_dealer_turn else "player",
+            "player_hand": [CARDS[code] for code in self.player_cards],
+            "player_hand_value": self.player_value,
+            "dealer_hand": [CARDS[code] for code in self.dealer_cards],
+            "dealer_hand_value": self.dealer_value,
+        }
+
+    def __str__(self):
+        return json.dumps(self.to_dict(), indent=4)
+
+    def __format__(self, format_spec):
+        return format(str(self), format_spec)
+
+class Player():
+    __slots__ = ('deck', 'cards', 'value', 'soft_aces')
+
+    def __init__(self, deck):
+        self.deck = deck
+        self.cards = []
+        self.value = 0
+        self.soft_aces = 0
+
+    def add(self, code):
+        self.cards.append(code)
+        self.value += CARD_VALUES[code]
+        if code == ACE:
+            self.soft_aces += 1
+        while self.value > 21 and self.soft_aces:
+            self.value -= 10
+            self.soft_aces -= 1
+
+    def hit(self, game_state):
+        self.add(self.deck.draw_card(game_state))
+
+    def hand_value(self):
+        return self.value
+
+    def hand(self):
+        return Counter(CARDS[code] for code in self.cards)
+
+class Dealer(Player):
+    __slots__ = ()
+
+class Deck():
+    __slots__ = ('draw_card_fn', 'cards')
+
+    def __init__(self, draw_card_fn):
+        self.draw_card_fn = draw_card_fn
+        self.cards = []
+
+    def draw_card(self, game_state):
+        if self.cards:
+            return self.cards.pop(0)
+        is_valid, card = False, None
+        i = 0
+        while not is_valid and i < 5:
+            is_valid, card = self.draw_card_fn(game_state)
+            i += 1
+        # Multi-card draw functions answer with a list, see blackjack.Deck.take.
+        if isinstance(card, list):
+            self.cards.extend(CARD_CODES[extra.lower()] for extra in card[1:])
+            card = card[0]
+        return CARD_CODES[card.lower()]
+
+class CompactBlackjack():
+    """
+    Drop-in replacement for Blackjack.play built on integer card codes. Hand
+    values and soft aces update as cards are added and game states render
+    lazily; given the same draw function it plays and returns exactly what
+    Blackjack does (card names in results are lower-case).
+    """
+    __slots__ = ('deck', 'player', 'dealer', 'is_dealer_turn')
+
+    def __init__(self, draw_card_fn):
+        self.deck = Deck(draw_card_fn)
+        self.player = Player(self.deck)
+        self.dealer = Dealer(self.deck)
+        self.is_dealer_turn = False
+
+    def deal_cards(self):
+        self.player.hit(self.game_state())
+        self.player.hit(self.game_state())
+
+        self.is_dealer_turn = True
+
+        self.dealer.hit(self.game_state())
+        self.dealer.hit(self.game_state())
+
+        self.is_dealer_turn = False
+
+    def play(self):
+        self.deal_cards()
+
+        player = self.player
+        dealer = self.dealer
+        threshold = 17 if CARD_VALUES[dealer.cards[0]] >= 7 else 12
+
+        while player.value < threshold:
+            player.hit(self.game_state())
+
+        player_value = player.value
+        push = 0
+
+        if player_value > 21:
+            return {
+                'player_win': 0,
+                'dealer_win': 1,
+                'push': push,
+                'dealer_bust': 0,
+                'player_hand_value': player_value,
+                'dealer_hand_value': dealer.value,
+                'player_hand': player.hand(),
+                'dealer_hand': dealer.hand()
+            }
+
+        self.is_dealer_turn = True
+
+        while dealer.value < 17:
+            dealer.hit(self.game_state())
+
+        dealer_value = dealer.value
+
+        if dealer_value > 21:
+            player_win = 1      # Dealer busts
+        elif player_value > dealer_value:
+            player_win = 1      # Player is closer to 21 than dealer
+        elif player_value == dealer_value:
+            player_win = 0    # It's a push
+            push = 1
+        else:
+            player_win = 0      # Dealer is closer to 21 than player
+
+        return {
+            'player_win': player_win,
+            'dealer_win': 1 if player_win == 0 and push == 0 else 0,
+            'push': push,
+            'dealer_bust': int(dealer_value > 21),
+            'player_hand_value': player_value,
+            'dealer_hand_value': dealer_value,
+            'player_hand': player.hand(),
+            'dealer_hand': dealer.hand()
+        }
+
+    def game_state(self):
+        return GameStateView(self)
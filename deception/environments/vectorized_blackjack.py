@@ -0,0 +1,76 @@
+import numpy as np
+from deception.environments.blackjack import CARDS, CARD_VALUES
+
+VALUES = np.array(CARD_VALUES)
+ACE = CARDS.index('ace')
+
+class HandArrays():
+    """
+    Hands of many games at once: per-card counts plus the running hand value
+    and the number of aces still counted as 11, matching Deck.hand_value.
+    """
+    def __init__(self, num_games):
+        self.counts = np.zeros((num_games, len(CARDS)), dtype=np.int64)
+        self.value = np.zeros(num_games, dtype=np.int64)
+        self.soft_aces = np.zeros(num_games, dtype=np.int64)
+
+    def add(self, games, cards):
+        np.add.at(self.counts, (games, cards), 1)
+        self.value[games] += VALUES[cards]
+        self.soft_aces[games] += cards == ACE
+        while True:
+            reduce = games[(self.value[games] > 21) & (self.soft_aces[games] > 0)]
+            if not len(reduce):
+                break
+            self.value[reduce] -= 10
+            self.soft_aces[reduce] -= 1
+
+def simulate_games(num_games, rng=None):
+    """
+    Plays num_games of Blackjack with uniform random draws (as random_draw_card)
+    using the same player policy and dealer rule as Blackjack.play. Returns a
+    dict of arrays, one entry per game.
+    """
+    rng = np.random.default_rng(rng)
+    games = np.arange(num_games)
+    player = HandArrays(num_games)
+    dealer = HandArrays(num_games)
+
+    def draw(hand, active):
+        hand.add(active, rng.integers(0, len(CARDS), size=len(active)))
+
+    draw(player, games)
+    draw(player, games)
+    first_dealer_cards = rng.integers(0, len(CARDS), size=num_games)
+    dealer.add(games, first_dealer_cards)
+    draw(dealer, games)
+
+    dealer_upcard = VALUES[first_dealer_cards]
+    player_threshold = np.where(dealer_upcard >= 7, 17, 12)
+
+    active = games[player.value < player_threshold]
+    while len(active):
+        draw(player, active)
+        active = active[player.value[active] < player_threshold[active]]
+
+    player_bust = player.value > 21
+
+    active = games[~player_bust & (dealer.value < 17)]
+    while len(active):
+        draw(dealer, active)
+        active = active[dealer.value[active] < 17]
+
+    dealer_bust = ~player_bust & (dealer.value > 21)
+    player_win = ~player_bust & (dealer_bust | (player.value > dealer.value))
+    push = ~player_bust & ~dealer_bust & (player.value == dealer.value)
+
+    return {
+        'player_win': player_win.astype(np.int64),
+        'dealer_win': (~player_win & ~push).astype(np.int64),
+        'push': push.astype(np.int64),
+        'dealer_bust': dealer_bust.astype(np.int64),
+        'player_hand_value': player.value,
+        'dealer_hand_value': dealer.value,
+        'player_hand': player.counts,
+        'dealer_hand': dealer.counts
+    }
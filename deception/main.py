@@ -1,23 +1,86 @@
-from collections import Counter
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import itertools
 import csv
+import random
 import threading
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-plt.switch_backend('agg')
-import seaborn as sns
 import tqdm
-from scipy import stats
-from deception.environments.blackjack import Blackjack
+from deception.environments.blackjack import Blackjack, BlackjackEnvironment, CARDS
+from deception.environments.compact_blackjack import CompactBlackjack
+from deception.environments.vectorized_blackjack import simulate_games
 from pyfiles.agent import *
+from pyfiles.checkpoint import CheckpointJournal
+from pyfiles.results_store import *
+from pyfiles.monitors import *
+from pyfiles.sequential import SequentialCardTest
+from pyfiles.tokens import TokenCounter
+from pyfiles.metrics import DrawMetrics
+from pyfiles.rate_limit import get_provider, get_rate_limiter, RateLimitMonitor
+from pyfiles.scheduler import expand_grid, GridScheduler
+from pyfiles.online_stats import OnlineStats
+from pyfiles.transcript import TranscriptRecorder, replay_games
+import pyfiles.agent as agents
+from pyfiles.framework import VectorEnvironment
 from pyfiles.prompt import *
-from pyfiles.statistical_analysis import *
-from pyfiles.utils import random_draw_card
-import ast
+from pyfiles.utils import random_draw_card, make_random_draw_card, LazyModule
+import cProfile
+import json
 import pickle
 import os
+import time
+
+# Plotting and statistics libraries take seconds to import, so they are
+# only loaded by the commands that use them.
+plt = LazyModule('matplotlib.pyplot', on_import=lambda plt: plt.switch_backend('agg'))
+sns = LazyModule('seaborn')
+statistical_analysis = LazyModule('pyfiles.statistical_analysis')
 
 DATA_FOLDER = "results"
 
+EXPERIMENT_FILES = {
+    'Baseline': {
+        'results': 'baseline/baseline_game_results.csv',
+    },
+    'GPT_0.0_Few_Shot': {
+        'results': 'gpt_0.0_few_shot/gpt_0.0_few_shot_game_results.csv',
+    },
+    'GPT_0.5_Few_Shot': {
+        'results': 'gpt_0.5_few_shot/gpt_0.5_few_shot_game_results.csv',
+    },
+    'GPT_0.0_Zero_Shot': {
+        'results': 'gpt_0.0_zero_shot/gpt_0.0_zero_shot_game_results.csv',
+    },
+    'GPT_0.5_Zero_Shot': {
+        'results': 'gpt_0.5_zero_shot/gpt_0.5_zero_shot_game_results.csv',
+    },
+    'Claude_0.0_Few_Shot': {
+        'results': 'claude_0.0_few_shot/claude_0.0_few_shot_game_results.csv',
+    },
+    'Claude_0.5_Few_Shot': {
+        'results': 'claude_0.5_few_shot/claude_0.5_few_shot_game_results.csv',
+    },
+    'Claude_0.0_Zero_Shot': {
+        'results': 'claude_0.0_zero_shot/claude_0.0_zero_shot_game_results.csv',
+    },
+    'Claude_0.5_Zero_Shot': {
+        'results': 'claude_0.5_zero_shot/claude_0.5_zero_shot_game_results.csv',
+    },
+    'Llama_0.0_Few_Shot': {
+        'results': 'llama_0.0_few_shot/llama_0.0_few_shot_game_results.csv',
+    },
+    'Llama_0.5_Few_Shot': {
+        'results': 'llama_0.5_few_shot/llama_0.5_few_shot_game_results.csv',
+    },
+    'Llama_0.0_Zero_Shot': {
+        'results': 'llama_0.0_zero_shot/llama_0.0_zero_shot_game_results.csv',
+    },
+    'Llama_0.5_Zero_Shot': {
+        'results': 'llama_0.5_zero_shot/llama_0.5_zero_shot_game_results.csv',
+    },
+}
+
 def get_latest_checkpoint(unique_str):
     unique_folder = os.path.join(DATA_FOLDER, unique_str)
     checkpoint_files = [f for f in os.listdir(unique_folder) if f.startswith(unique_str) and f.endswith('.pkl')]
@@ -33,32 +96,23 @@ def load_checkpoint(filename):
 
 def create_plots(unique_str):
     unique_folder = os.path.join(DATA_FOLDER, unique_str)
-    results_df = pd.read_csv(os.path.join(unique_folder, f'{unique_str}_game_results.csv'))
-
-    results_df_melted = results_df.melt(value_vars=['player_hand_value', 'dealer_hand_value'], 
-                                        var_name='hand_type', 
-                                        value_name='hand_value')
+    histograms = load_histograms(os.path.join(unique_folder, f'{unique_str}_game_results.csv'))
+    hand_values = hand_value_frame(histograms)
+    player_values = [int(value) for value in histograms['player_hand_value']]
 
     plt.figure(figsize=(12, 6))
-    sns.histplot(data=results_df_melted, x='hand_value', hue='hand_type', 
+    sns.histplot(data=hand_values, x='hand_value', hue='hand_type', weights='count',
                  fill=True, binwidth=0.5, multiple='dodge')
     plt.title(f'Distribution of Hand Values ({unique_str})', fontsize=16)
     plt.xlabel('Hand Value', fontsize=12)
     plt.ylabel('Density', fontsize=12)
-    plt.xticks(range(int(results_df['player_hand_value'].min()), int(results_df['player_hand_value'].max()) + 1))
+    plt.xticks(range(min(player_values), max(player_values) + 1))
     plt.tight_layout()
     plt.savefig(os.path.join(unique_folder, f'{unique_str}_hand_value_distributions.png'), dpi=300)
     plt.close()
 
-    CARDS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king', 'ace']
-    dealer_hands = results_df['dealer_hand'].apply(eval).apply(Counter)
-    player_hands = results_df['player_hand'].apply(eval).apply(Counter)
-    
-    dealer_card_freq = Counter()
-    player_card_freq = Counter()
-    for dealer_hand, player_hand in zip(dealer_hands, player_hands):
-        dealer_card_freq += dealer_hand
-        player_card_freq += player_hand
+    dealer_card_freq = pd.Series(histograms['dealer_hand'], dtype=int)
+    player_card_freq = pd.Series(histograms['player_hand'], dtype=int)
     
     dealer_df = pd.DataFrame(list(dealer_card_freq.items()), columns=['Card', 'Frequency'])
     dealer_df['Type'] = 'Dealer'
@@ -84,52 +138,53 @@ def create_plots(unique_str):
 
     print("Plots generated.")
 
-def run_experiment(num_games, draw_card_fn, unique_str):
+def open_checkpoint(unique_str, monitors=()):
+    """
+    Returns the checkpoint journal for unique_str and the games already in it,
+    restoring `monitors` to where the run left off. A legacy .pkl checkpoint
+    is migrated into a fresh journal.
+    """
     unique_folder = os.path.join(DATA_FOLDER, unique_str)
-    if not os.path.exists(unique_folder):
-        os.makedirs(unique_folder)
+    journal = CheckpointJournal(os.path.join(unique_folder, f'{unique_str}_checkpoint.journal'))
+    payloads = journal.load()
+    results = [game for payload in payloads for game in payload['games']]
 
-    results = []
-    start_game_id = 0
-    previous_file = None
+    if not results:
+        latest_checkpoint = get_latest_checkpoint(unique_str)
+        if latest_checkpoint:
+            results = load_checkpoint(latest_checkpoint)
+            journal.append(results)
 
-    latest_checkpoint = get_latest_checkpoint(unique_str)
-    if latest_checkpoint:
-        results = load_checkpoint(latest_checkpoint)
-        start_game_id = int(latest_checkpoint.split('_')[-1].replace('.pkl', ''))
-        previous_file = latest_checkpoint
+    states = payloads[-1].get('monitor_states') if payloads else None
+    restore_monitors(monitors, states, results)
 
-    pbar = tqdm.tqdm(range(start_game_id, num_games))
+    return journal, results
 
-    for game_id in pbar:
-        game = Blackjack(draw_card_fn)
-        result = game.play()
-        results.append(result)
-        pbar.set_description(desc=f"Game {game_id}")
-        
-        if (game_id + 1) % 100 == 0:
-            pickle_filename = os.path.join(unique_folder, f'{unique_str}_game_results_{game_id+1}.pkl')
-            with open(pickle_filename, 'wb') as f:
-                pickle.dump(results, f)
+def write_checkpoint(journal, games, monitors=()):
+    start = time.perf_counter()
+    journal.append(games, monitor_states=monitor_states(monitors))
+    elapsed = time.perf_counter() - start
+    for monitor in monitors:
+        monitor.checkpoint_written(elapsed)
 
-            if previous_file and os.path.exists(previous_file):
-                os.remove(previous_file)
-            
-            previous_file = pickle_filename
+def save_results(results, num_games, unique_str, extra_stats=None):
+    unique_folder = os.path.join(DATA_FOLDER, unique_str)
 
-    results_df = pd.DataFrame(results)
-    results_df["dealer_hand"] = results_df["dealer_hand"].apply(lambda x: dict(x))
-    results_df["player_hand"] = results_df["player_hand"].apply(lambda x: dict(x))
-    results_df.to_csv(os.path.join(unique_folder, f'{unique_str}_game_results.csv'), index=False)
+    results_df = results_to_frame(results)
+    save_results_store(results_df, os.path.join(unique_folder, f'{unique_str}_game_results.npz'))
+    frame_to_csv_frame(results_df).to_csv(os.path.join(unique_folder, f'{unique_str}_game_results.csv'), index=False)
 
     summary_stats = {
-        'total_games': num_games,
+        'total_games': len(results_df),
         'player_win_rate': results_df['player_win'].mean(),
         'dealer_bust_rate': results_df['dealer_bust'].mean(),
         'push_rate': results_df['push'].mean(),
         'avg_player_hand': results_df['player_hand_value'].mean(),
         'avg_dealer_hand': results_df['dealer_hand_value'].mean()
     }
+    if len(results_df) < num_games:
+        summary_stats['requested_games'] = num_games
+    summary_stats.update(extra_stats or {})
 
     with open(os.path.join(unique_folder, f'{unique_str}_summary_stats.csv'), 'w', newline='') as f:
         writer = csv.writer(f)
@@ -137,26 +192,385 @@ def run_experiment(num_games, draw_card_fn, unique_str):
             writer.writerow([key, value])
     
     print("Experiment completed. Data saved to CSV files.")
+
+def run_experiment(num_games, draw_card_fn, unique_str, monitors=(), game_cls=Blackjack):
+    """
+    monitors: ExperimentMonitor objects updated after every game; the run
+      ends early once any of them asks to stop.
+    game_cls: Blackjack, or CompactBlackjack for the faster integer-coded engine.
+    """
+    unique_folder = os.path.join(DATA_FOLDER, unique_str)
+    if not os.path.exists(unique_folder):
+        os.makedirs(unique_folder)
+
+    journal, results = open_checkpoint(unique_str, monitors)
+    checkpointed = len(results)
+    stop = any(monitor.should_stop() for monitor in monitors)
+
+    pbar = tqdm.tqdm(range(len(results), num_games))
+
+    for game_id in pbar:
+        if stop:
+            break
+
+        game = game_cls(draw_card_fn)
+        start_monitors(monitors)
+        result = game.play()
+        finish_monitors(monitors, result)
+        results.append(result)
+        stop = update_monitors(monitors, [result])
+        pbar.set_description(desc=f"Game {game_id}")
+        
+        if (game_id + 1) % 100 == 0:
+            write_checkpoint(journal, results[checkpointed:], monitors)
+            checkpointed = len(results)
+
+    pbar.close()
+
+    if checkpointed < len(results):
+        write_checkpoint(journal, results[checkpointed:], monitors)
+
+    save_results(results, num_games, unique_str, monitor_summary(monitors))
+
+async def _play_games_async(num_games, draw_card_fn, concurrency, journal, results, monitors, game_cls=Blackjack):
+    start_game_id = len(results)
+    checkpointed = len(results)
+    stop = any(monitor.should_stop() for monitor in monitors)
+    finished = {}
+    next_game_id = iter(range(start_game_id, num_games))
+    pbar = tqdm.tqdm(total=num_games - start_game_id)
+
+    async def worker():
+        nonlocal checkpointed, stop
+        for game_id in next_game_id:
+            if stop:
+                break
+
+            game = game_cls(draw_card_fn)
+            start_monitors(monitors)
+            finished[game_id] = result = await game.aplay()
+            finish_monitors(monitors, result)
+            pbar.update(1)
+
+            # Games finish out of order; only the contiguous prefix is
+            # moved into results so checkpoints stay resumable by count.
+            while not stop and len(results) in finished:
+                results.append(finished.pop(len(results)))
+                stop = update_monitors(monitors, results[-1:])
+                if len(results) % 100 == 0:
+                    write_checkpoint(journal, results[checkpointed:], monitors)
+                    checkpointed = len(results)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    pbar.close()
+
+    if checkpointed < len(results):
+        write_checkpoint(journal, results[checkpointed:], monitors)
+
+def run_experiment_async(num_games, draw_card_fn, unique_str, concurrency=16, monitors=(), game_cls=Blackjack):
+    """
+    Async variant of run_experiment. draw_card_fn must be a coroutine function
+    (see get_adraw_card_fn); up to `concurrency` games are kept in flight at once.
+    game_cls: an engine with an async aplay; CompactBlackjack only plays synchronously.
+    """
+    unique_folder = os.path.join(DATA_FOLDER, unique_str)
+    if not os.path.exists(unique_folder):
+        os.makedirs(unique_folder)
+
+    journal, results = open_checkpoint(unique_str, monitors)
+
+    asyncio.run(_play_games_async(num_games, draw_card_fn, concurrency, journal, results, monitors, game_cls))
+
+    save_results(results, num_games, unique_str, monitor_summary(monitors))
     
+def run_vectorized_experiment(num_games, agent_controller, unique_str, batch_size=64):
+    """
+    Plays games in lockstep chunks of `batch_size`, handing every pending draw
+    of a chunk to agent_controller.make_decisions in a single call.
+    """
+    unique_folder = os.path.join(DATA_FOLDER, unique_str)
+    if not os.path.exists(unique_folder):
+        os.makedirs(unique_folder)
+
+    journal, results = open_checkpoint(unique_str)
+
+    pbar = tqdm.tqdm(total=num_games, initial=len(results))
+
+    while len(results) < num_games:
+        environments = [BlackjackEnvironment() for _ in range(min(batch_size, num_games - len(results)))]
+        vector_environment = VectorEnvironment(environments, agent_controller, "draw_card")
+        batch_results = vector_environment.run()
+        results.extend(batch_results)
+        journal.append(batch_results)
+        pbar.update(len(environments))
+
+    pbar.close()
+    save_results(results, num_games, unique_str)
+
 def run_control_experiment(num_games, unique_str):
-    run_experiment(num_games, random_draw_card, unique_str)
+    run_experiment(num_games, random_draw_card, unique_str, game_cls=CompactBlackjack)
 
-def run_agent_experiment(num_games, unique_str, agent, prompt):
-    draw_card_fn = get_draw_card_fn(agent, prompt)
-    run_experiment(num_games, draw_card_fn, unique_str)
+def run_vectorized_control_experiment(num_games, unique_str, seed=None):
+    """Random control baseline simulated with NumPy arrays instead of one Blackjack game at a time."""
+    unique_folder = os.path.join(DATA_FOLDER, unique_str)
+    if not os.path.exists(unique_folder):
+        os.makedirs(unique_folder)
+
+    save_results(simulate_games(num_games, seed), num_games, unique_str)
+
+SHARD_SIZE = 10000
+
+def derive_seed(seed, shard_id):
+    """Seed for one shard, derived from the master seed and the shard's index alone."""
+    return int(np.random.SeedSequence([seed, shard_id]).generate_state(1)[0])
+
+def shard_journal(data_folder, unique_str, shard_id):
+    return CheckpointJournal(os.path.join(data_folder, unique_str, 'shards', f'{unique_str}_shard_{shard_id:05d}.journal'))
+
+def _play_shard(data_folder, unique_str, shard_id, num_games, seed, run_games, shard_size, checkpoint_every=1000):
+    """
+    Plays one shard of run_sharded_control_experiment in a worker process.
+    The generator state is checkpointed with the games, so a resumed shard
+    carries on with exactly the cards it would have drawn. The run's
+    num_games and shard_size are checkpointed too, since they decide which
+    games each shard holds; resuming with others raises ValueError.
+    """
+    journal = shard_journal(data_folder, unique_str, shard_id)
+    payloads = journal.load()
+    played = sum(len(payload['games']) for payload in payloads)
+    rng = random.Random(derive_seed(seed, shard_id))
+    if payloads:
+        if payloads[-1]['seed'] != seed:
+            raise ValueError(f"Shard {shard_id} of {unique_str} was played with seed {payloads[-1]['seed']}, not {seed}.")
+        for key, value in (('num_games', run_games), ('shard_size', shard_size)):
+            # Shards checkpointed before the layout was recorded cannot be checked.
+            if payloads[-1].get(key, value) != value:
+                raise ValueError(f"Shard {shard_id} of {unique_str} was played with {key}={payloads[-1][key]}, not {value}.")
+        rng.setstate(payloads[-1]['rng_state'])
+
+    draw_card_fn = make_random_draw_card(rng)
+    new_games = 0
+    while played < num_games:
+        games = [CompactBlackjack(draw_card_fn).play() for _ in range(min(checkpoint_every, num_games - played))]
+        journal.append(games, seed=seed, rng_state=rng.getstate(), num_games=run_games, shard_size=shard_size)
+        played += len(games)
+        new_games += len(games)
+    return new_games
+
+def run_sharded_control_experiment(num_games, unique_str, seed=None, shard_size=SHARD_SIZE, max_workers=None):
+    """
+    Random control baseline split into shards of `shard_size` games that are
+    played on a process pool. Shard i draws from its own generator seeded
+    with derive_seed(seed, i) and checkpoints to its own journal under
+    {unique_str}/shards; finished shards are merged in order into the usual
+    results files. The split depends only on num_games and shard_size, not
+    on the number of workers, so the same seed gives identical results on
+    any machine. With seed=None the seed of an interrupted run is reused, or
+    a new one is chosen; either way it is recorded in the summary stats.
+    Resuming with a different num_games or shard_size raises ValueError.
+    """
+    ensure_directory_exists(os.path.join(DATA_FOLDER, unique_str, 'shards'))
+
+    if seed is None:
+        payloads = shard_journal(DATA_FOLDER, unique_str, 0).load()
+        seed = payloads[0]['seed'] if payloads else random.SystemRandom().randrange(2 ** 32)
+
+    shards = [(shard_id, min(shard_size, num_games - start)) for shard_id, start in enumerate(range(0, num_games, shard_size))]
+
+    pbar = tqdm.tqdm(total=num_games)
+    with ProcessPoolExecutor(max_workers) as executor:
+        futures = [executor.submit(_play_shard, DATA_FOLDER, unique_str, shard_id, shard_games, seed, num_games, shard_size) for shard_id, shard_games in shards]
+        for future in as_completed(futures):
+            pbar.update(future.result())
+    pbar.close()
+
+    results = [game for shard_id, _ in shards for game in shard_journal(DATA_FOLDER, unique_str, shard_id).load_games()]
+    save_results(results, num_games, unique_str, {'seed': seed, 'shards': len(shards)})
+
+def baseline_card_frequencies(control):
+    """Drawn card frequencies of the `control` run in CARDS order, or None if it has not been run."""
+    results_path = os.path.join(DATA_FOLDER, control, f'{control}_game_results.csv')
+    if not os.path.exists(results_path):
+        return None
+    histograms = load_histograms(results_path)
+    counts = [sum(histograms[hand].get(card, 0) for hand in HANDS) for card in CARDS]
+    return [count / sum(counts) for count in counts]
+
+def live_summary_path(unique_str):
+    return os.path.join(DATA_FOLDER, unique_str, f'{unique_str}_live_summary.json')
+
+def transcript_path(unique_str):
+    return os.path.join(DATA_FOLDER, unique_str, f'{unique_str}_transcript.jsonl')
+
+def run_agent_experiment(num_games, unique_str, agent, prompt, concurrency=None, cache=None, early_stopping=False, state_encoding='pretty', profile=False, rate_limiter=None, monitors=(), cards_per_call=1, control='baseline', stream=False, record_transcript=True, game_cls=Blackjack):
+    """
+    early_stopping: stop once SequentialCardTest rejects a uniform deck
+      (pass a SequentialCardTest to choose alpha/prior yourself).
+    state_encoding: 'pretty' (indented JSON, as in the original runs) or
+      'compact'; token totals are added to the summary stats either way.
+    profile: also write a cProfile dump of the run to {unique_str}_profile.prof
+      (viewable with snakeviz, or as a flamegraph with flameprof).
+    rate_limiter: RateLimiter for the calls; defaults to the one shared by
+      every run against the agent's provider (see PROVIDER_LIMITS).
+    monitors: extra ExperimentMonitors for the run.
+    cards_per_call: ask for this many upcoming cards per call (pair it with
+      multi_card_prompt(cards_per_call)); recorded per game and in the
+      summary stats so multi-card runs can be told apart.
+    control: run whose card frequencies the live KL/JS divergences are
+      measured against (uniform if it does not exist). The live summary is
+      rewritten to {unique_str}_live_summary.json every 100 games.
+    stream: stream answers and stop reading as soon as the card is parsed
+      (see get_streaming_draw_card_fn). Streaming draws cannot be combined
+      with a cache or multi-card draws; they share the rate limiter.
+    record_transcript: append every draw (state, raw response, parsed card,
+      attempt, latency) to {unique_str}_transcript.jsonl, so the run can be
+      replayed offline with run_replay_experiment.
+    game_cls: Blackjack, or CompactBlackjack to cut the per-game overhead
+      around the model calls; concurrent runs need an engine with aplay,
+      which CompactBlackjack does not have.
+
+    Per-draw phase timings, latency histograms, invalid-response rate and
+    throughput are written to {unique_str}_metrics.json.
+    """
+    if stream and (cache is not None or cards_per_call > 1):
+        raise ValueError("Streaming draws do not support response caching or multi-card draws.")
+    if concurrency and not hasattr(game_cls, 'aplay'):
+        raise ValueError(f"{game_cls.__name__} cannot play concurrent games; use Blackjack.")
+
+    token_counter = TokenCounter(get_model_name(agent))
+    metrics = DrawMetrics()
+    if rate_limiter is None:
+        rate_limiter = get_rate_limiter(get_provider(agent))
+    draw_mode = ResultLabels(
+        columns={'cards_per_call': cards_per_call},
+        summary_stats={'draw_mode': 'multi_card' if cards_per_call > 1 else 'single_card', 'cards_per_call': cards_per_call},
+    )
+    online_stats = OnlineStats(baseline_card_frequencies(control), live_summary_path(unique_str))
+    monitors = [token_counter, metrics, RateLimitMonitor(rate_limiter), draw_mode, online_stats, *monitors]
+    transcript = None
+    if record_transcript:
+        os.makedirs(os.path.join(DATA_FOLDER, unique_str), exist_ok=True)
+        transcript = TranscriptRecorder(transcript_path(unique_str), prompt, get_model_name(agent), state_encoding, cards_per_call)
+        monitors.append(transcript)
+    if early_stopping:
+        monitors.append(early_stopping if isinstance(early_stopping, SequentialCardTest) else SequentialCardTest())
+
+    profiler = cProfile.Profile() if profile else None
+    if profiler is not None:
+        profiler.enable()
+
+    if stream and concurrency:
+        draw_card_fn = get_astreaming_draw_card_fn(agent, prompt, state_encoding=state_encoding, token_counter=token_counter, metrics=metrics, transcript=transcript, rate_limiter=rate_limiter)
+        run_experiment_async(num_games, draw_card_fn, unique_str, concurrency, monitors, game_cls)
+    elif stream:
+        draw_card_fn = get_streaming_draw_card_fn(agent, prompt, state_encoding=state_encoding, token_counter=token_counter, metrics=metrics, transcript=transcript, rate_limiter=rate_limiter)
+        run_experiment(num_games, draw_card_fn, unique_str, monitors, game_cls)
+    elif concurrency:
+        draw_card_fn = get_adraw_card_fn(agent, prompt, cache=cache, state_encoding=state_encoding, token_counter=token_counter, metrics=metrics, rate_limiter=rate_limiter, cards_per_call=cards_per_call, transcript=transcript)
+        run_experiment_async(num_games, draw_card_fn, unique_str, concurrency, monitors, game_cls)
+    else:
+        draw_card_fn = get_draw_card_fn(agent, prompt, cache=cache, state_encoding=state_encoding, token_counter=token_counter, metrics=metrics, rate_limiter=rate_limiter, cards_per_call=cards_per_call, transcript=transcript)
+        run_experiment(num_games, draw_card_fn, unique_str, monitors, game_cls)
+
+    unique_folder = os.path.join(DATA_FOLDER, unique_str)
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(os.path.join(unique_folder, f'{unique_str}_profile.prof'))
+    metrics.write(os.path.join(unique_folder, f'{unique_str}_metrics.json'))
+
+    if cache is not None:
+        print(f"Response cache: {cache.stats()}")
+
+def run_logprob_experiment(num_games, unique_str, agent, prompt, top_logprobs=20, seed=None, sample_temperature=1.0, cache=None, state_encoding='pretty'):
+    """
+    Plays with cards sampled locally from the model's logprob distribution
+    for each game state (see get_logprob_draw_card_fn); the model is called
+    once per distinct state. The distributions are written to
+    {unique_str}_draw_distributions.json for analysis.
+    """
+    token_counter = TokenCounter(get_model_name(agent))
+    draw_card_fn = get_logprob_draw_card_fn(agent, prompt, top_logprobs=top_logprobs, seed=seed, sample_temperature=sample_temperature,
+                                            cache=cache, state_encoding=state_encoding, token_counter=token_counter)
+    draw_mode = ResultLabels(summary_stats={'draw_mode': 'logprob', 'sample_temperature': sample_temperature})
+    run_experiment(num_games, draw_card_fn, unique_str, [token_counter, draw_mode])
+
+    distributions = [
+        {'game_state': json.loads(state), **dict(zip(CARDS, probabilities))}
+        for state, probabilities in draw_card_fn.distributions.items()
+    ]
+    with open(os.path.join(DATA_FOLDER, unique_str, f'{unique_str}_draw_distributions.json'), 'w') as f:
+        json.dump(distributions, f, indent=4)
+
+def run_replay_experiment(source, unique_str, game_cls=CompactBlackjack, parse=None, strict=False):
+    """
+    Replays the games recorded in the transcript of run `source` (see
+    record_transcript) with the current game code and parser, and saves
+    them as run `unique_str`. No model is called.
+    parse: content -> (is_valid, card); defaults to the parser the run used.
+    strict: fail if a replayed game reaches a state other than the recorded one.
+    """
+    unique_folder = os.path.join(DATA_FOLDER, unique_str)
+    if not os.path.exists(unique_folder):
+        os.makedirs(unique_folder)
+
+    results = replay_games(transcript_path(source), game_cls, parse=parse, strict=strict)
+    save_results(results, len(results), unique_str, {'replayed_from': source})
+
+# Agents are looked up by name in MODEL_REGISTRY when their config runs;
+# configs naming an agent that is not registered are skipped.
+EXPERIMENT_GRID = {
+    'gpt': {'provider': 'openai', 'agents': {'0.0': 'agent_gpt_0', '0.5': 'agent_gpt_5'}},
+    'claude': {'provider': 'anthropic', 'agents': {'0.0': 'agent_claude_0', '0.5': 'agent_claude_5'}},
+}
+
+GRID_PROMPTS = {
+    'few_shot': FEW_SHOT_PROMPT,
+    'zero_shot': ZERO_SHOT_PROMPT,
+}
+
+# pyplot keeps global state, so grid configs finishing together take turns plotting.
+PLOT_LOCK = threading.Lock()
+
+def run_experiment_grid(num_games, grid=EXPERIMENT_GRID, prompts=GRID_PROMPTS, control='baseline', provider_limits=None, concurrency=None):
+    """
+    Runs every model x temperature x prompt config in `grid` at once, at most
+    provider_limits[provider] (default 2) configs per provider at a time, and
+    runs the statistical analysis against `control` and the plots as each
+    config finishes. Progress is tracked in DATA_FOLDER/grid_state.json;
+    rerunning skips finished configs and resumes the rest. Configs whose
+    agent is not in MODEL_REGISTRY are skipped with a message.
+    concurrency: games in flight per config (see run_agent_experiment).
+    """
+    control_file = os.path.join(control, f'{control}_game_results.csv')
+    if not os.path.exists(os.path.join(DATA_FOLDER, control_file)):
+        run_control_experiment(num_games, control)
+
+    def run_config(config, progress):
+        name = config['name']
+        agent = getattr(agents, config['agent'])
+        run_agent_experiment(num_games, name, agent, config['prompt'], concurrency=concurrency, monitors=[progress])
+        run_statistical_analysis(control_file, os.path.join(name, f'{name}_game_results.csv'), name)
+        with PLOT_LOCK:
+            create_plots(name)
+
+    configs = []
+    for config in expand_grid(grid, prompts):
+        if config['agent'] in agents.MODEL_REGISTRY:
+            configs.append(config)
+        else:
+            print(f"[grid] skipping {config['name']}: unknown agent {config['agent']} (not in MODEL_REGISTRY)")
+
+    ensure_directory_exists(DATA_FOLDER)
+    scheduler = GridScheduler(configs, run_config, os.path.join(DATA_FOLDER, 'grid_state.json'), provider_limits, report=print)
+    return scheduler.run()
 
 def ensure_directory_exists(directory):
     if not os.path.exists(directory):
         os.makedirs(directory)
 
 def load_and_parse_data(control_file, experiment_file):
-    control_df = pd.read_csv(os.path.join(DATA_FOLDER, control_file))
-    experiment_df = pd.read_csv(os.path.join(DATA_FOLDER, experiment_file))
-    
-    for df in [control_df, experiment_df]:
-        df['dealer_hand'] = df['dealer_hand'].apply(lambda x: ast.literal_eval(x))
-        df['player_hand'] = df['player_hand'].apply(lambda x: ast.literal_eval(x))
-    
+    control_df = load_results(os.path.join(DATA_FOLDER, control_file))
+    experiment_df = load_results(os.path.join(DATA_FOLDER, experiment_file))
     return control_df, experiment_df
 
 def run_statistical_analysis(control_file, experiment_file, experiment_name):
@@ -167,74 +581,151 @@ def run_statistical_analysis(control_file, experiment_file, experiment_name):
 
     control_df, experiment_df = load_and_parse_data(control_file, experiment_file)
 
-    tests = {
-        "KL Divergence for Dealer Card Frequencies": lambda: compute_kl_divergence(control_df, experiment_df, 'dealer_hand'),
-        "KL Divergence for Player Card Frequencies": lambda: compute_kl_divergence(control_df, experiment_df, 'player_hand'),
-        "Jensen-Shannon Distance for Dealer Card Frequencies": lambda: compute_jensenshannon_distance(control_df, experiment_df, 'dealer_hand'),
-        "Jensen-Shannon Distance for Player Card Frequencies": lambda: compute_jensenshannon_distance(control_df, experiment_df, 'player_hand'),
-        "Chi-Squared Test for Dealer Card Frequencies": lambda: chi_squared_test(control_df, experiment_df, 'dealer_hand'),
-        "Chi-Squared Test for Player Card Frequencies": lambda: chi_squared_test(control_df, experiment_df, 'player_hand'),
-        "Kolmogorov-Smirnov Test for Dealer Card Frequencies": lambda: kolmogorov_smirnov_test(control_df, experiment_df, 'dealer_hand'),
-        "Kolmogorov-Smirnov Test for Player Card Frequencies": lambda: kolmogorov_smirnov_test(control_df, experiment_df, 'player_hand'),
-        "Anderson-Darling Test for Dealer Card Frequencies": lambda: anderson_darling_test(control_df, experiment_df, 'dealer_hand'),
-        "Anderson-Darling Test for Player Card Frequencies": lambda: anderson_darling_test(control_df, experiment_df, 'player_hand'),
-        "KL Divergence for Dealer Final Hand Values": lambda: compute_kl_divergence(control_df, experiment_df, 'dealer_hand_value'),
-        "KL Divergence for Player Final Hand Values": lambda: compute_kl_divergence(control_df, experiment_df, 'player_hand_value'),
-        "Chi-Squared Test for Dealer Final Hand Values": lambda: chi_squared_test(control_df, experiment_df, 'dealer_hand_value'),
-        "Chi-Squared Test for Player Final Hand Values": lambda: chi_squared_test(control_df, experiment_df, 'player_hand_value'),
-        "Kolmogorov-Smirnov Test for Dealer Final Hand Values": lambda: kolmogorov_smirnov_test(control_df, experiment_df, 'dealer_hand_value'),
-        "Kolmogorov-Smirnov Test for Player Final Hand Values": lambda: kolmogorov_smirnov_test(control_df, experiment_df, 'player_hand_value'),
-        "Anderson-Darling Test for Dealer Final Hand Values": lambda: anderson_darling_test(control_df, experiment_df, 'dealer_hand_value'),
-        "Anderson-Darling Test for Player Final Hand Values": lambda: anderson_darling_test(control_df, experiment_df, 'player_hand_value')
-    }
-    
-    results = {}
-    for test_name, test_fn in tests.items():
-        print(f"Running {test_name}...")
-        results[test_name] = test_fn()
-
-    with open(os.path.join(output_dir, f'{experiment_name}_statistical_results.csv'), 'w', newline='') as f:
-        writer = csv.writer(f)
-        for test_name, result in results.items():
-            writer.writerow([test_name, result])
+    results = statistical_analysis.run_analysis(control_df, experiment_df)
+    results.to_csv(os.path.join(output_dir, f'{experiment_name}_statistical_results.csv'), index=False)
     
     print("Statistical analysis complete.")
 
+def run_exact_analysis(experiment_file, experiment_name):
+    """run_statistical_analysis against the exact random-control distributions instead of a control run."""
+    print("Starting exact statistical analysis")
+
+    output_dir = os.path.join(DATA_FOLDER, 'statistical_analysis')
+    ensure_directory_exists(output_dir)
+
+    experiment_df = load_results(os.path.join(DATA_FOLDER, experiment_file))
+
+    results = statistical_analysis.run_exact_analysis(experiment_df)
+    results.to_csv(os.path.join(output_dir, f'{experiment_name}_exact_statistical_results.csv'), index=False)
+
+    print("Exact statistical analysis complete.")
+
+def run_bootstrap_analysis(control_file, experiment_file, experiment_name, num_resamples=10000, seed=None):
+    print("Starting bootstrap analysis")
+
+    output_dir = os.path.join(DATA_FOLDER, 'statistical_analysis')
+    ensure_directory_exists(output_dir)
+
+    control_df, experiment_df = load_and_parse_data(control_file, experiment_file)
+
+    results = statistical_analysis.bootstrap_analysis(control_df, experiment_df, num_resamples=num_resamples, seed=seed)
+    results.to_csv(os.path.join(output_dir, f'{experiment_name}_bootstrap_results.csv'), index=False)
+
+    print("Bootstrap analysis complete.")
+
+PLOT_GROUPS = {
+    'Baseline_and_0.5_Temperature': [
+        'Baseline',
+        'GPT_0.5_Few_Shot',
+        'GPT_0.5_Zero_Shot',
+        'Claude_0.5_Few_Shot',
+        'Claude_0.5_Zero_Shot',
+        'Llama_0.5_Few_Shot',
+        'Llama_0.5_Zero_Shot'
+    ],
+    'Baseline_and_0.0_Temperature': [
+        'Baseline',
+        'GPT_0.0_Few_Shot',
+        'GPT_0.0_Zero_Shot',
+        'Claude_0.0_Few_Shot',
+        'Claude_0.0_Zero_Shot',
+        'Llama_0.0_Few_Shot',
+        'Llama_0.0_Zero_Shot'
+    ]
+}
+
+_comparison_frames = {}
+
+def _init_comparison_worker(frames):
+    _comparison_frames.update(frames)
+
+def _compare_pair(pair):
+    control_name, experiment_name = pair
+    results = statistical_analysis.run_analysis(_comparison_frames[control_name], _comparison_frames[experiment_name])
+    results.insert(0, 'control', control_name)
+    results.insert(1, 'experiment', experiment_name)
+    return results
+
+def run_comparison_matrix(experiment_files, mode='baseline', baseline='Baseline', max_workers=None):
+    """
+    Runs the full test suite on every experiment against `baseline`
+    (mode='baseline') or on every ordered pair of experiments (mode='all').
+    Each results file is loaded once and shared with the worker processes.
+    """
+    print("Starting comparison matrix")
+
+    output_dir = os.path.join(DATA_FOLDER, 'statistical_analysis')
+    ensure_directory_exists(output_dir)
+
+    frames = {
+        name: load_results(os.path.join(DATA_FOLDER, files['results']))
+        for name, files in experiment_files.items()
+    }
+
+    if mode == 'baseline':
+        pairs = [(baseline, name) for name in frames if name != baseline]
+    else:
+        pairs = list(itertools.permutations(frames, 2))
+
+    with ProcessPoolExecutor(max_workers, initializer=_init_comparison_worker, initargs=(frames,)) as executor:
+        matrix = pd.concat(executor.map(_compare_pair, pairs), ignore_index=True)
+        matrix.to_csv(os.path.join(output_dir, f'comparison_matrix_{mode}.csv'), index=False)
+
+        heatmaps = [(test_name, test_df, mode, list(frames)) for test_name, test_df in matrix.groupby('test', sort=False)]
+        list(executor.map(create_comparison_heatmap, *zip(*heatmaps)))
+
+    print("Comparison matrix complete.")
+    return matrix
+
+def create_comparison_heatmap(test_name, test_df, mode, names):
+    output_dir = os.path.join(DATA_FOLDER, 'statistical_analysis')
+    features = list(test_df['feature'].unique())
+
+    fig, axes = plt.subplots(1, len(features), figsize=(8 * len(features), 7))
+    for ax, feature in zip(axes, features):
+        pivot = test_df[test_df['feature'] == feature].pivot(index='control', columns='experiment', values='statistic')
+        pivot = pivot.reindex(index=[n for n in names if n in pivot.index], columns=[n for n in names if n in pivot.columns])
+        sns.heatmap(pivot, ax=ax, cmap='viridis', annot=mode == 'baseline', fmt='.2g', square=mode != 'baseline')
+        ax.set_title(feature)
+    fig.suptitle(f'{test_name} ({mode})', fontsize=16)
+    plt.tight_layout()
+    test_slug = test_name.lower().replace(' ', '_').replace('-', '_')
+    plt.savefig(os.path.join(output_dir, f'comparison_matrix_{mode}_{test_slug}.png'), dpi=150)
+    plt.close(fig)
+
 def create_combined_plots(group_name, model_names, plot_type, experiment_files):
     num_models = len(model_names)
     num_cols = 2
     num_rows = (num_models + 1) // 2
     fig_width = 30 * num_cols
     fig_height = 20 * num_rows
-    fig, axes = plt.subplots(num_rows, num_cols, figsize=(fig_width, fig_height), sharex=False)
-    axes = axes.flatten()
+    # A local rc_context instead of plt.rcParams.update keeps the large font
+    # from leaking into other figures rendered by the same worker process.
+    with plt.rc_context({'font.size': 80}):
+        fig, axes = plt.subplots(num_rows, num_cols, figsize=(fig_width, fig_height), sharex=False)
+        _draw_combined_plots(fig, axes.flatten(), group_name, model_names, plot_type, experiment_files)
 
-    plt.rcParams.update({'font.size': 80})
+    print(f"{plot_type.capitalize()} plots generated for {group_name}.")
+
+def _draw_combined_plots(fig, axes, group_name, model_names, plot_type, experiment_files):
 
     handles = []
     labels = []
 
-    if plot_type == 'card_frequency':
-        CARDS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king', 'ace']
-    
     for idx, model_name in enumerate(model_names):
         model_file = experiment_files[model_name]['results']
-        model_df = pd.read_csv(os.path.join(DATA_FOLDER, model_file))
+        histograms = load_histograms(os.path.join(DATA_FOLDER, model_file))
 
         ax = axes[idx]
 
         if plot_type == 'hand_value':
-            results_df_melted = model_df.melt(
-                value_vars=['player_hand_value', 'dealer_hand_value'],
-                var_name='hand_type',
-                value_name='hand_value'
-            )
-            results_df_melted['hand_value'] = results_df_melted['hand_value'].astype(int)  # Ensure hand values are integers
+            results_df_melted = hand_value_frame(histograms)
             legend_setting = True if idx == 0 else False
             sns.histplot(
                 data=results_df_melted,
                 x='hand_value',
                 hue='hand_type',
+                weights='count',
                 fill=True,
                 binwidth=1,
                 multiple='dodge',
@@ -256,14 +747,8 @@ def create_combined_plots(group_name, model_names, plot_type, experiment_files):
                     ax.get_legend().remove()
 
         elif plot_type == 'card_frequency':
-            dealer_hands = model_df['dealer_hand'].apply(eval).apply(Counter)
-            player_hands = model_df['player_hand'].apply(eval).apply(Counter)
-
-            dealer_card_freq = Counter()
-            player_card_freq = Counter()
-            for dealer_hand, player_hand in zip(dealer_hands, player_hands):
-                dealer_card_freq += dealer_hand
-                player_card_freq += player_hand
+            dealer_card_freq = pd.Series(histograms['dealer_hand'], dtype=int)
+            player_card_freq = pd.Series(histograms['player_hand'], dtype=int)
 
             dealer_df = pd.DataFrame(list(dealer_card_freq.items()), columns=['Card', 'Frequency'])
             dealer_df['Type'] = 'Dealer'
@@ -315,94 +800,58 @@ def create_combined_plots(group_name, model_names, plot_type, experiment_files):
     plt.savefig(plot_filename)
     plt.close()
 
-    print(f"{plot_type.capitalize()} plots generated for {group_name}.")
+def render_plots(experiment_files, plot_groups, max_workers=None):
+    """
+    Render the per-experiment plots and every combined grid in parallel worker
+    processes. Histogram aggregates are built (or loaded from cache) once per
+    experiment up front so the workers only read small JSON files.
+    """
+    for files in experiment_files.values():
+        load_histograms(os.path.join(DATA_FOLDER, files['results']))
+
+    with ProcessPoolExecutor(max_workers) as executor:
+        futures = [
+            executor.submit(create_plots, os.path.dirname(files['results']))
+            for files in experiment_files.values()
+        ]
+        futures += [
+            executor.submit(create_combined_plots, group_name, model_names, plot_type, experiment_files)
+            for group_name, model_names in plot_groups.items()
+            for plot_type in ['hand_value', 'card_frequency']
+        ]
+        for future in futures:
+            future.result()
 
 if __name__ == "__main__":
     NUM_GAMES = 1000
 
     # run_control_experiment(NUM_GAMES, "baseline")
-    # run_agent_experiment(NUM_GAMES, "gpt_0.0_few_shot", agent_gpt_0, FEW_SHOT_PROMPT)
-    # run_agent_experiment(NUM_GAMES, "gpt_0.5_few_shot", agent_gpt_5, FEW_SHOT_PROMPT)
-    # run_agent_experiment(NUM_GAMES, "gpt_0.0_zero_shot", agent_gpt_0, ZERO_SHOT_PROMPT)
-    # run_agent_experiment(NUM_GAMES, "gpt_0.5_zero_shot", agent_gpt_5, ZERO_SHOT_PROMPT)
-    # run_agent_experiment(NUM_GAMES, "claude_0.0_few_shot", agent_claude_0, FEW_SHOT_PROMPT)
-    # run_agent_experiment(NUM_GAMES, "claude_0.5_few_shot", agent_claude_5, FEW_SHOT_PROMPT)
-    # run_agent_experiment(NUM_GAMES, "claude_0.0_zero_shot", agent_claude_0, ZERO_SHOT_PROMPT)
-    # run_agent_experiment(NUM_GAMES, "claude_0.5_zero_shot", agent_claude_5, ZERO_SHOT_PROMPT)
-    # run_agent_experiment(NUM_GAMES, "llama_0.0_few_shot", agent_llama_0, FEW_SHOT_PROMPT)
-    # run_agent_experiment(NUM_GAMES, "llama_0.5_few_shot", agent_llama_5, FEW_SHOT_PROMPT)
-    # run_agent_experiment(NUM_GAMES, "llama_0.0_zero_shot", agent_llama_0, ZERO_SHOT_PROMPT)
-    # run_agent_experiment(NUM_GAMES, "llama_0.5_zero_shot", agent_llama_5, ZERO_SHOT_PROMPT)
-
-    experiment_files = {
-        'Baseline': {
-            'results': 'baseline/baseline_game_results.csv',
-        },
-        'GPT_0.0_Few_Shot': {
-            'results': 'gpt_0.0_few_shot/gpt_0.0_few_shot_game_results.csv',
-        },
-        'GPT_0.5_Few_Shot': {
-            'results': 'gpt_0.5_few_shot/gpt_0.5_few_shot_game_results.csv',
-        },
-        'GPT_0.0_Zero_Shot': {
-            'results': 'gpt_0.0_zero_shot/gpt_0.0_zero_shot_game_results.csv',
-        },
-        'GPT_0.5_Zero_Shot': {
-            'results': 'gpt_0.5_zero_shot/gpt_0.5_zero_shot_game_results.csv',
-        },
-        'Claude_0.0_Few_Shot': {
-            'results': 'claude_0.0_few_shot/claude_0.0_few_shot_game_results.csv',
-        },
-        'Claude_0.5_Few_Shot': {
-            'results': 'claude_0.5_few_shot/claude_0.5_few_shot_game_results.csv',
-        },
-        'Claude_0.0_Zero_Shot': {
-            'results': 'claude_0.0_zero_shot/claude_0.0_zero_shot_game_results.csv',
-        },
-        'Claude_0.5_Zero_Shot': {
-            'results': 'claude_0.5_zero_shot/claude_0.5_zero_shot_game_results.csv',
-        },
-        'Llama_0.0_Few_Shot': {
-            'results': 'llama_0.0_few_shot/llama_0.0_few_shot_game_results.csv',
-        },
-        'Llama_0.5_Few_Shot': {
-            'results': 'llama_0.5_few_shot/llama_0.5_few_shot_game_results.csv',
-        },
-        'Llama_0.0_Zero_Shot': {
-            'results': 'llama_0.0_zero_shot/llama_0.0_zero_shot_game_results.csv',
-        },
-        'Llama_0.5_Zero_Shot': {
-            'results': 'llama_0.5_zero_shot/llama_0.5_zero_shot_game_results.csv',
-        },
-    }
+    # run_agent_experiment(NUM_GAMES, "gpt_0.0_few_shot", agents.agent_gpt_0, FEW_SHOT_PROMPT)
+    # run_agent_experiment(NUM_GAMES, "gpt_0.5_few_shot", agents.agent_gpt_5, FEW_SHOT_PROMPT)
+    # run_agent_experiment(NUM_GAMES, "gpt_0.0_zero_shot", agents.agent_gpt_0, ZERO_SHOT_PROMPT)
+    # run_agent_experiment(NUM_GAMES, "gpt_0.5_zero_shot", agents.agent_gpt_5, ZERO_SHOT_PROMPT)
+    # run_agent_experiment(NUM_GAMES, "claude_0.0_few_shot", agents.agent_claude_0, FEW_SHOT_PROMPT)
+    # run_agent_experiment(NUM_GAMES, "claude_0.5_few_shot", agents.agent_claude_5, FEW_SHOT_PROMPT)
+    # run_agent_experiment(NUM_GAMES, "claude_0.0_zero_shot", agents.agent_claude_0, ZERO_SHOT_PROMPT)
+    # run_agent_experiment(NUM_GAMES, "claude_0.5_zero_shot", agents.agent_claude_5, ZERO_SHOT_PROMPT)
+    # run_agent_experiment(NUM_GAMES, "llama_0.0_few_shot", agents.agent_llama_0, FEW_SHOT_PROMPT)
+    # run_agent_experiment(NUM_GAMES, "llama_0.5_few_shot", agents.agent_llama_5, FEW_SHOT_PROMPT)
+    # run_agent_experiment(NUM_GAMES, "llama_0.0_zero_shot", agents.agent_llama_0, ZERO_SHOT_PROMPT)
+    # run_agent_experiment(NUM_GAMES, "llama_0.5_zero_shot", agents.agent_llama_5, ZERO_SHOT_PROMPT)
+
+    # run_experiment_grid(NUM_GAMES)
+
+    experiment_files = EXPERIMENT_FILES
+
+    # run_comparison_matrix(experiment_files, mode='baseline')
+    # run_comparison_matrix(experiment_files, mode='all')
+
+    # convert_folder(DATA_FOLDER)
+    # convert_folder("data-files")
 
     # for experiment_name, files in experiment_files.items():
     #     print(f"Creating plots for {experiment_name}")
     #     run_statistical_analysis(experiment_name)
     #     create_plots(experiment_name)
 
-    group_name = 'Baseline_and_0.5_Temperature'
-    model_names = [
-        'Baseline',
-        'GPT_0.5_Few_Shot',
-        'GPT_0.5_Zero_Shot',
-        'Claude_0.5_Few_Shot',
-        'Claude_0.5_Zero_Shot',
-        'Llama_0.5_Few_Shot',
-        'Llama_0.5_Zero_Shot'
-    ]
-    create_combined_plots(group_name, model_names, 'hand_value', experiment_files)
-    create_combined_plots(group_name, model_names, 'card_frequency', experiment_files)
-
-    group_name = 'Baseline_and_0.0_Temperature'
-    model_names = [
-        'Baseline',
-        'GPT_0.0_Few_Shot',
-        'GPT_0.0_Zero_Shot',
-        'Claude_0.0_Few_Shot',
-        'Claude_0.0_Zero_Shot',
-        'Llama_0.0_Few_Shot',
-        'Llama_0.0_Zero_Shot'
-    ]
-    create_combined_plots(group_name, model_names, 'hand_value', experiment_files)
-    create_combined_plots(group_name, model_names, 'card_frequency', experiment_files)
\ No newline at end of file
+    render_plots(experiment_files, PLOT_GROUPS)
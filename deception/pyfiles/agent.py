@@ -1,23 +1,64 @@
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-# from langchain_together import ChatTogether
-import envkey
+from deception.environments.blackjack import CARDS
+from pyfiles.framework import AgentController
+from pyfiles.prompt import render_game_state, render_prompt
+from functools import partial
+import importlib
+import json
+import math
+import random
 import re
 import os
+import threading
+import time
+from types import SimpleNamespace
 
-envkey.load()
 
-CARDS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king', 'ace']
+# Chat clients are built on first use, so importing this module needs
+# neither the LangChain provider packages nor API keys.
+MODEL_REGISTRY = {
+    'agent_gpt_0': {'client': 'langchain_openai.ChatOpenAI', 'model': "gpt-4o-2024-08-06", 'api_key': 'OPENAI_API_KEY', 'temperature': 0},
+    'agent_gpt_5': {'client': 'langchain_openai.ChatOpenAI', 'model': "gpt-4o-2024-08-06", 'api_key': 'OPENAI_API_KEY', 'temperature': 0.5},
+    'agent_claude_0': {'client': 'langchain_anthropic.ChatAnthropic', 'model': "claude-3-5-sonnet-20240620", 'api_key': 'ANTHROPIC_API_KEY', 'temperature': 0},
+    'agent_claude_5': {'client': 'langchain_anthropic.ChatAnthropic', 'model': "claude-3-5-sonnet-20240620", 'api_key': 'ANTHROPIC_API_KEY', 'temperature': 0.5},
+    # 'agent_mixstral_0': {'client': 'langchain_together.ChatTogether', 'model': "mistralai/Mixtral-8x7B-Instruct-v0.1", 'api_key': 'TOGETHERAI_API_KEY'},
+}
 
-agent_gpt_0 = ChatOpenAI(model="gpt-4o-2024-08-06", api_key=os.environ['OPENAI_API_KEY'], temperature=0, cache=False)
-agent_gpt_5 = ChatOpenAI(model="gpt-4o-2024-08-06", api_key=os.environ['OPENAI_API_KEY'], temperature=0.5, cache=False)
-agent_claude_0 = ChatAnthropic(model="claude-3-5-sonnet-20240620", api_key=os.environ['ANTHROPIC_API_KEY'], temperature=0, cache=False)
-agent_claude_5 = ChatAnthropic(model="claude-3-5-sonnet-20240620", api_key=os.environ['ANTHROPIC_API_KEY'], temperature=0.5, cache=False)
-# agent_mixstral_0 = ChatTogether(model="mistralai/Mixtral-8x7B-Instruct-v0.1", api_key=os.environ['TOGETHERAI_API_KEY'], cache=False)
+_agents = {}
+_agents_lock = threading.Lock()
+_keys_loaded = False
+
+def load_api_keys():
+    global _keys_loaded
+    if not _keys_loaded:
+        import envkey
+        envkey.load()
+        _keys_loaded = True
+
+def get_agent(name):
+    """Builds (once) and returns the chat client registered as `name` in MODEL_REGISTRY."""
+    with _agents_lock:
+        if name not in _agents:
+            spec = dict(MODEL_REGISTRY[name])
+            module_name, class_name = spec.pop('client').rsplit('.', 1)
+            client_cls = getattr(importlib.import_module(module_name), class_name)
+            load_api_keys()
+            spec['api_key'] = os.environ[spec['api_key']]
+            _agents[name] = client_cls(**spec, cache=False)
+        return _agents[name]
+
+def __getattr__(name):
+    # Keeps `agents.agent_gpt_0` and `from pyfiles.agent import agent_gpt_0` working.
+    if name in MODEL_REGISTRY:
+        return get_agent(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def parse_response(response):
-    pattern = r'\b([2-9]|10|ace|queen|jack|king)\b'
-    card = re.findall(pattern, response.content, re.IGNORECASE)
+    return parse_content(response.content)
+
+CARD_PATTERN = re.compile(r'\b([2-9]|10|ace|queen|jack|king)\b', re.IGNORECASE)
+
+def parse_content(content):
+    card = CARD_PATTERN.findall(content)
     if not card:
         return False, None
     str_card = card[0].lower().strip()
@@ -26,8 +67,301 @@ def parse_response(response):
         return is_valid, None
     return is_valid, str_card
 
-def get_draw_card_fn(agent, prompt):
+def parse_cards(content, max_cards=None):
+    """Every card named in `content`, in order, keeping at most `max_cards`."""
+    cards = [card.lower() for card in CARD_PATTERN.findall(content)]
+    return [card for card in cards if card in CARDS][:max_cards]
+
+def parse_card_sequence(content, max_cards=None):
+    """
+    parse_content for multi-card draws: returns (is_valid, cards) with the
+    list of cards in the answer, which Deck.draw_card buffers.
+    """
+    cards = parse_cards(content, max_cards)
+    return bool(cards), cards or None
+
+def get_model_name(agent):
+    return getattr(agent, 'model_name', None) or getattr(agent, 'model', None) or type(agent).__name__
+
+def check_cache_allowed(agent, cache, cache_sampled):
+    # Replaying cached answers for sampled temperatures would remove exactly
+    # the randomness the experiments measure, so it has to be asked for.
+    if cache is not None and getattr(agent, 'temperature', None) != 0 and not cache_sampled:
+        raise ValueError("Response caching is only enabled for temperature 0 agents; pass cache_sampled=True to override.")
+
+def get_content_parser(cards_per_call):
+    if cards_per_call == 1:
+        return parse_content
+    return partial(parse_card_sequence, max_cards=cards_per_call)
+
+def get_draw_card_fn(agent, prompt, cache=None, cache_sampled=False, state_encoding='pretty', token_counter=None, metrics=None, rate_limiter=None, cards_per_call=1, transcript=None):
+    """
+    cache: optional ResponseCache. Only responses that parse to a valid card
+      are stored, so retries for unparseable answers still reach the model.
+    state_encoding: 'pretty' or 'compact', see render_game_state.
+    token_counter: optional TokenCounter fed every call that reaches the model.
+    metrics: optional DrawMetrics that records render/call/parse times.
+    rate_limiter: optional RateLimiter that throttles calls and retries
+      rate-limit and transport errors with backoff.
+    cards_per_call: above 1, each answer is parsed as a sequence of up to
+      that many cards (use a multi_card_prompt) and the Deck serves later
+      draws from it.
+    transcript: optional TranscriptRecorder that logs every draw, cached or
+      not, for offline replay.
+    """
+    check_cache_allowed(agent, cache, cache_sampled)
+    parse = get_content_parser(cards_per_call)
+
+    def func(game_state):
+        start = time.perf_counter()
+        rendered_state = render_game_state(game_state, state_encoding)
+        if cache is not None:
+            key = cache.make_key(get_model_name(agent), agent.temperature, prompt, rendered_state)
+            content = cache.get(key)
+            if content is not None:
+                looked_up = time.perf_counter()
+                is_valid, card = parse(content)
+                if metrics is not None:
+                    metrics.record_draw(is_valid, cached=True, cache_lookup=looked_up - start, parse=time.perf_counter() - looked_up)
+                if transcript is not None:
+                    transcript.record_draw(game_state, content, is_valid, card, cached=True)
+                return is_valid, card
+
+        prompt_text = prompt.format(game_state=rendered_state)
+        rendered = time.perf_counter()
+        output = rate_limiter.invoke(agent, prompt_text) if rate_limiter is not None else agent.invoke(prompt_text)
+        called = time.perf_counter()
+        if token_counter is not None:
+            token_counter.record_draw(prompt_text, output)
+
+        is_valid, card = parse(output.content)
+        if metrics is not None:
+            metrics.record_draw(is_valid, render=rendered - start, llm_call=called - rendered, parse=time.perf_counter() - called)
+        if transcript is not None:
+            transcript.record_draw(game_state, output.content, is_valid, card, latency=called - rendered)
+        if cache is not None and is_valid:
+            cache.put(key, output.content)
+        return is_valid, card
+    return func
+
+def get_adraw_card_fn(agent, prompt, cache=None, cache_sampled=False, state_encoding='pretty', token_counter=None, metrics=None, rate_limiter=None, cards_per_call=1, transcript=None):
+    check_cache_allowed(agent, cache, cache_sampled)
+    parse = get_content_parser(cards_per_call)
+
+    async def func(game_state):
+        start = time.perf_counter()
+        rendered_state = render_game_state(game_state, state_encoding)
+        if cache is not None:
+            key = cache.make_key(get_model_name(agent), agent.temperature, prompt, rendered_state)
+            content = cache.get(key)
+            if content is not None:
+                looked_up = time.perf_counter()
+                is_valid, card = parse(content)
+                if metrics is not None:
+                    metrics.record_draw(is_valid, cached=True, cache_lookup=looked_up - start, parse=time.perf_counter() - looked_up)
+                if transcript is not None:
+                    transcript.record_draw(game_state, content, is_valid, card, cached=True)
+                return is_valid, card
+
+        prompt_text = prompt.format(game_state=rendered_state)
+        rendered = time.perf_counter()
+        output = await (rate_limiter.ainvoke(agent, prompt_text) if rate_limiter is not None else agent.ainvoke(prompt_text))
+        called = time.perf_counter()
+        if token_counter is not None:
+            token_counter.record_draw(prompt_text, output)
+
+        is_valid, card = parse(output.content)
+        if metrics is not None:
+            metrics.record_draw(is_valid, render=rendered - start, llm_call=called - rendered, parse=time.perf_counter() - called)
+        if transcript is not None:
+            transcript.record_draw(game_state, output.content, is_valid, card, latency=called - rendered)
+        if cache is not None and is_valid:
+            cache.put(key, output.content)
+        return is_valid, card
+    return func
+
+def find_card(text, final=False):
+    """
+    First card named in a partial answer. A match that reaches the end of
+    `text` could still grow ('ace' -> 'aces', '10' -> '100'), so it only
+    counts once a following character arrives or the stream is `final`;
+    the result is then the same card parse_content finds in the full answer.
+    """
+    match = CARD_PATTERN.search(text)
+    if match is None or (match.end() == len(text) and not final):
+        return None
+    return match.group(1).lower()
+
+def chunk_text(chunk):
+    content = chunk.content
+    if isinstance(content, str):
+        return content
+    # Anthropic streams content blocks rather than plain strings.
+    return "".join(block.get('text', '') if isinstance(block, dict) else block for block in content)
+
+def record_stream(prompt_text, text, card, start, rendered, first_token, finished, token_counter, metrics):
+    if token_counter is not None:
+        token_counter.record_draw(prompt_text, SimpleNamespace(content=text, usage_metadata=None))
+    if metrics is not None:
+        metrics.record_draw(card is not None, render=rendered - start, llm_call=finished - rendered)
+        if first_token is not None:
+            metrics.record('time_to_first_token', first_token - rendered)
+        if card is not None:
+            metrics.record('time_to_card', finished - rendered)
+
+def get_streaming_draw_card_fn(agent, prompt, state_encoding='pretty', token_counter=None, metrics=None, transcript=None, rate_limiter=None):
+    """
+    Streams the answer and runs the card regex as tokens arrive, closing the
+    stream (which cancels the request) as soon as a card is certain instead
+    of waiting for any extra text the model adds. Token counts cover only
+    the tokens received; metrics gets time_to_first_token and time_to_card.
+    A transcript records the text received up to the card.
+    rate_limiter: optional RateLimiter that throttles opening each stream
+      and retries a stream that fails (it is read again from the start).
+    """
     def func(game_state):
-        output = agent.invoke(prompt.format(game_state=game_state))
-        return parse_response(output)
-    return func
\ No newline at end of file
+        start = time.perf_counter()
+        prompt_text = render_prompt(prompt, game_state, state_encoding)
+        rendered = time.perf_counter()
+
+        def read_stream():
+            text, card, first_token = "", None, None
+            stream = agent.stream(prompt_text)
+            try:
+                for chunk in stream:
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                    text += chunk_text(chunk)
+                    card = find_card(text)
+                    if card is not None:
+                        break
+            finally:
+                stream.close()
+            return text, card, first_token
+
+        text, card, first_token = rate_limiter.call(read_stream, prompt_text) if rate_limiter is not None else read_stream()
+        if card is None:
+            card = find_card(text, final=True)
+
+        finished = time.perf_counter()
+        record_stream(prompt_text, text, card, start, rendered, first_token, finished, token_counter, metrics)
+        if transcript is not None:
+            transcript.record_draw(game_state, text, card is not None, card, latency=finished - rendered)
+        return card is not None, card
+    return func
+
+def get_astreaming_draw_card_fn(agent, prompt, state_encoding='pretty', token_counter=None, metrics=None, transcript=None, rate_limiter=None):
+    async def func(game_state):
+        start = time.perf_counter()
+        prompt_text = render_prompt(prompt, game_state, state_encoding)
+        rendered = time.perf_counter()
+
+        async def read_stream():
+            text, card, first_token = "", None, None
+            stream = agent.astream(prompt_text)
+            try:
+                async for chunk in stream:
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                    text += chunk_text(chunk)
+                    card = find_card(text)
+                    if card is not None:
+                        break
+            finally:
+                await stream.aclose()
+            return text, card, first_token
+
+        text, card, first_token = await (rate_limiter.acall(read_stream, prompt_text) if rate_limiter is not None else read_stream())
+        if card is None:
+            card = find_card(text, final=True)
+
+        finished = time.perf_counter()
+        record_stream(prompt_text, text, card, start, rendered, first_token, finished, token_counter, metrics)
+        if transcript is not None:
+            transcript.record_draw(game_state, text, card is not None, card, latency=finished - rendered)
+        return card is not None, card
+    return func
+
+def card_distribution(response):
+    """
+    Normalized probabilities over CARDS from the top logprobs of the first
+    answer token that names a card, or None when the response carries no
+    logprobs (e.g. providers that do not expose them).
+    """
+    logprobs = (getattr(response, 'response_metadata', None) or {}).get('logprobs') or {}
+    for position in logprobs.get('content') or []:
+        probabilities = [0.0] * len(CARDS)
+        for candidate in position.get('top_logprobs') or []:
+            card = candidate['token'].strip().lower()
+            if card in CARDS:
+                probabilities[CARDS.index(card)] += math.exp(candidate['logprob'])
+        total = sum(probabilities)
+        if total > 0:
+            return [probability / total for probability in probabilities]
+    return None
+
+def sample_card(probabilities, rng, temperature=1.0):
+    if temperature == 0:
+        return CARDS[max(range(len(CARDS)), key=probabilities.__getitem__)]
+    weights = [probability ** (1 / temperature) for probability in probabilities]
+    return rng.choices(CARDS, weights=weights)[0]
+
+def get_logprob_draw_card_fn(agent, prompt, top_logprobs=20, seed=None, sample_temperature=1.0, cache=None, state_encoding='pretty', token_counter=None):
+    """
+    Draws by asking the model once per distinct game state for its token
+    logprobs, normalizing them over CARDS and sampling locally.
+
+    sample_temperature: rescales the model's distribution before sampling
+      (1.0 samples it as is, 0 always takes the most likely card).
+    cache: optional ResponseCache that persists the distributions across runs.
+    The per-state distributions are kept on func.distributions, keyed by
+    the rendered game state. Responses without logprobs fall back to parsing
+    the answer text and are not cached.
+    """
+    logprob_agent = agent.bind(logprobs=True, top_logprobs=top_logprobs)
+    rng = random.Random(seed)
+    distributions = {}
+    cache_prompt = f"{prompt}#logprobs"
+
+    def func(game_state):
+        rendered_state = render_game_state(game_state, state_encoding)
+        probabilities = distributions.get(rendered_state)
+
+        if probabilities is None and cache is not None:
+            key = cache.make_key(get_model_name(agent), None, cache_prompt, rendered_state)
+            content = cache.get(key)
+            if content is not None:
+                probabilities = distributions[rendered_state] = json.loads(content)
+
+        if probabilities is None:
+            prompt_text = prompt.format(game_state=rendered_state)
+            output = logprob_agent.invoke(prompt_text)
+            if token_counter is not None:
+                token_counter.record_draw(prompt_text, output)
+            probabilities = card_distribution(output)
+            if probabilities is None:
+                return parse_response(output)
+            distributions[rendered_state] = probabilities
+            if cache is not None:
+                cache.put(key, json.dumps(probabilities))
+
+        return True, sample_card(probabilities, rng, sample_temperature)
+
+    func.distributions = distributions
+    return func
+
+class DrawCardController(AgentController):
+    """Draws cards for BlackjackEnvironment decision points, batching prompts through agent.batch."""
+    def __init__(self, agent, prompt, max_concurrency=None):
+        self.agent = agent
+        self.prompt = prompt
+        self.max_concurrency = max_concurrency
+
+    def make_decision(self, decision_point):
+        output = self.agent.invoke(self.prompt.format(game_state=decision_point.state["game_state"]))
+        return parse_response(output)[1]
+
+    def make_decisions(self, decision_points):
+        prompts = [self.prompt.format(game_state=decision_point.state["game_state"]) for decision_point in decision_points]
+        outputs = self.agent.batch(prompts, config={"max_concurrency": self.max_concurrency})
+        return [parse_response(output)[1] for output in outputs]
@@ -0,0 +1,69 @@
+import hashlib
+import json
+import sqlite3
+import threading
+
+class ResponseCache():
+    """
+    Disk-backed cache of raw LLM responses, keyed on model, temperature,
+    prompt template and rendered game state. Holds at most `max_entries`
+    responses and evicts the least recently used ones beyond that.
+    """
+    def __init__(self, path, max_entries=100_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, content TEXT NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self.conn.commit()
+        self.size, clock = self.conn.execute("SELECT COUNT(*), MAX(last_used) FROM responses").fetchone()
+        self.clock = clock or 0
+
+    @staticmethod
+    def make_key(model, temperature, prompt, game_state):
+        template_hash = hashlib.sha256(prompt.encode()).hexdigest()
+        key = json.dumps([model, temperature, template_hash, str(game_state)])
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            row = self.conn.execute("SELECT content FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.clock += 1
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (self.clock, key))
+            self.conn.commit()
+            return row[0]
+
+    def put(self, key, content):
+        with self.lock:
+            self.clock += 1
+            inserted = self.conn.execute(
+                "INSERT OR IGNORE INTO responses (key, content, last_used) VALUES (?, ?, ?)", (key, content, self.clock)
+            ).rowcount
+            self.size += inserted
+            if self.size > self.max_entries:
+                self.conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+                    (self.size - self.max_entries,)
+                )
+                self.size = self.max_entries
+            self.conn.commit()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'cache_hits': self.hits,
+            'cache_misses': self.misses,
+            'cache_hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,63 @@
+import os
+import pickle
+import struct
+import zlib
+
+class CheckpointJournal():
+    """
+    Append-only checkpoint log. Every append writes one framed record (length,
+    crc32, pickled payload) holding only the games played since the previous
+    append and fsyncs it, so checkpoint cost stays constant per game. A torn
+    trailing record left by a crash fails its checksum and is dropped on load.
+    """
+    HEADER = struct.Struct('<II')
+
+    def __init__(self, path):
+        self.path = path
+
+    def append(self, games, **extra):
+        data = pickle.dumps({'games': games, **extra}, protocol=pickle.HIGHEST_PROTOCOL)
+        record = self.HEADER.pack(len(data), zlib.crc32(data)) + data
+
+        is_new = not os.path.exists(self.path)
+        with open(self.path, 'ab') as f:
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if is_new:
+            # Make the new directory entry itself durable.
+            dir_fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def load(self):
+        """Return every intact record payload, truncating a torn tail if there is one."""
+        if not os.path.exists(self.path):
+            return []
+
+        with open(self.path, 'rb') as f:
+            buffer = f.read()
+
+        payloads = []
+        offset = 0
+        while offset + self.HEADER.size <= len(buffer):
+            length, checksum = self.HEADER.unpack_from(buffer, offset)
+            start = offset + self.HEADER.size
+            data = buffer[start:start + length]
+            if len(data) < length or zlib.crc32(data) != checksum:
+                break
+            payloads.append(pickle.loads(data))
+            offset = start + length
+
+        if offset < len(buffer):
+            with open(self.path, 'r+b') as f:
+                f.truncate(offset)
+                os.fsync(f.fileno())
+
+        return payloads
+
+    def load_games(self):
+        return [game for payload in self.load() for game in payload['games']]
@@ -0,0 +1,127 @@
+from deception.environments.blackjack import CARDS, CARD_VALUES
+from pyfiles.results_store import HANDS
+
+UNIFORM = [1 / len(CARDS)] * len(CARDS)
+
+# Hands are tracked as (value, soft_aces) states, where soft_aces counts the
+# aces still worth 11, exactly as CompactBlackjack's Player does.
+EMPTY_HAND = (0, 0)
+
+def add_card(state, card_value):
+    value, soft_aces = state
+    value += card_value
+    soft_aces += card_value == 11
+    while value > 21 and soft_aces:
+        value -= 10
+        soft_aces -= 1
+    return value, soft_aces
+
+def draw(distribution, probabilities):
+    """Distribution of hand states after one more card."""
+    drawn = {}
+    for state, p in distribution.items():
+        for card_value, q in zip(CARD_VALUES, probabilities):
+            new_state = add_card(state, card_value)
+            drawn[new_state] = drawn.get(new_state, 0.0) + p * q
+    return drawn
+
+def play_out(distribution, threshold, probabilities):
+    """
+    Hits every hand below `threshold` until it stands or busts. Returns the
+    distribution of final states and the expected number of hits.
+    """
+    final = {}
+    expected_hits = 0.0
+    while distribution:
+        hitting = {}
+        for state, p in distribution.items():
+            if state[0] >= threshold:
+                final[state] = final.get(state, 0.0) + p
+            else:
+                hitting[state] = p
+                expected_hits += p
+        distribution = draw(hitting, probabilities) if hitting else {}
+    return final, expected_hits
+
+def hand_values(distribution, weight=1.0, into=None):
+    values = {} if into is None else into
+    for (value, _), p in distribution.items():
+        values[value] = values.get(value, 0.0) + weight * p
+    return values
+
+def exact_baseline(card_probabilities=None):
+    """
+    Exact per-game distributions of the random control, computed by dynamic
+    programming over hand states instead of sampling games. Follows the
+    policy in Blackjack.play: the player hits below 17 when the dealer's
+    first card is worth 7 or more and below 12 otherwise, and the dealer
+    hits below 17 unless the player has busted.
+
+    card_probabilities: chance of each card in CARDS order on every draw
+      (uniform by default, as in random_draw_card).
+
+    Returns a dict with
+      'player_hand_value' / 'dealer_hand_value': {final value: probability}
+      'player_hand' / 'dealer_hand': {card: expected count per game}
+      'player_cards' / 'dealer_cards': expected cards per game
+      'player_win', 'dealer_win', 'push', 'dealer_bust', 'player_bust':
+        probabilities of the result flags.
+    """
+    probabilities = card_probabilities or UNIFORM
+    player_start = draw(draw({EMPTY_HAND: 1.0}, probabilities), probabilities)
+    player_outcomes = {threshold: play_out(player_start, threshold, probabilities) for threshold in (12, 17)}
+
+    baseline = {
+        'player_hand_value': {},
+        'dealer_hand_value': {},
+        'player_cards': 2.0,
+        'dealer_cards': 2.0,
+        'player_win': 0.0,
+        'dealer_win': 0.0,
+        'push': 0.0,
+        'dealer_bust': 0.0,
+        'player_bust': 0.0,
+    }
+
+    for upcard_value, p_upcard in zip(CARD_VALUES, probabilities):
+        if not p_upcard:
+            continue
+        player_final, player_hits = player_outcomes[17 if upcard_value >= 7 else 12]
+        dealer_start = draw({add_card(EMPTY_HAND, upcard_value): 1.0}, probabilities)
+        dealer_final, dealer_hits = play_out(dealer_start, 17, probabilities)
+
+        player_bust = sum(p for (value, _), p in player_final.items() if value > 21)
+        player_stands = hand_values({state: p for state, p in player_final.items() if state[0] <= 21})
+        dealer_values = hand_values(dealer_final)
+
+        hand_values(player_final, p_upcard, baseline['player_hand_value'])
+        # The dealer only plays on when the player has not busted.
+        hand_values(dealer_start, p_upcard * player_bust, baseline['dealer_hand_value'])
+        hand_values(dealer_final, p_upcard * (1 - player_bust), baseline['dealer_hand_value'])
+        baseline['player_cards'] += p_upcard * player_hits
+        baseline['dealer_cards'] += p_upcard * (1 - player_bust) * dealer_hits
+
+        baseline['player_bust'] += p_upcard * player_bust
+        baseline['dealer_win'] += p_upcard * player_bust
+        for player_value, p_player in player_stands.items():
+            for dealer_value, p_dealer in dealer_values.items():
+                p = p_upcard * p_player * p_dealer
+                if dealer_value > 21:
+                    baseline['dealer_bust'] += p
+                    baseline['player_win'] += p
+                elif player_value > dealer_value:
+                    baseline['player_win'] += p
+                elif player_value == dealer_value:
+                    baseline['push'] += p
+                else:
+                    baseline['dealer_win'] += p
+
+    # Every draw is independent of whether it happens, so each card's
+    # expected count is its probability times the expected number of draws.
+    for hand in HANDS:
+        cards = baseline[hand.replace('_hand', '_cards')]
+        baseline[hand] = {card: cards * p for card, p in zip(CARDS, probabilities)}
+    for column in ('player_hand_value', 'dealer_hand_value'):
+        baseline[column] = dict(sorted(baseline[column].items()))
+
+    return baseline
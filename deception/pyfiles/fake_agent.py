@@ -0,0 +1,113 @@
+import asyncio
+import math
+import random
+import re
+import time
+from deception.environments.blackjack import CARDS
+
+CHATTER = " is the card I drew from the shuffled deck for this hand, and I hope it brings you luck at the table tonight."
+
+class FakeMessage():
+    def __init__(self, content, response_metadata=None):
+        self.content = content
+        self.response_metadata = response_metadata or {}
+
+class FakeAPIError(Exception):
+    """Carries a status_code like the provider SDK errors do."""
+    def __init__(self, status_code, message="Rate limit reached"):
+        super().__init__(message)
+        self.status_code = status_code
+
+class FakeAgent():
+    """
+    Local stand-in for a LangChain chat model. Every call sleeps for `latency`
+    seconds and answers with a random card (uniform unless `card_weights`
+    gives one weight per card in CARDS), so experiments can be run and timed
+    without touching a provider. With `invalid_rate`, that share of answers
+    contains no card, which exercises the retry path in Deck.draw_card; with
+    `error_rate`, that share of calls raises FakeAPIError(error_status).
+    `cards_per_response` > 1 answers with a comma-separated card sequence.
+    Responses carry synthetic OpenAI-style logprobs for the first card,
+    taken from `card_weights`.
+
+    For streaming, `chatter` extra words follow the answer (models often
+    ignore "Do not give any additional details") and every word-sized token
+    takes `token_latency` seconds after the `latency` to the first one.
+    `streamed_tokens` counts the tokens actually produced, so cancelled
+    streams can be checked.
+    """
+    def __init__(self, latency=0.0, seed=None, temperature=0.0, card_weights=None, invalid_rate=0.0, error_rate=0.0, error_status=429, cards_per_response=1,
+                 chatter=0, token_latency=0.0):
+        self.model_name = "fake"
+        self.latency = latency
+        self.temperature = temperature
+        self.card_weights = card_weights
+        self.invalid_rate = invalid_rate
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.cards_per_response = cards_per_response
+        self.chatter = "".join(re.findall(r'\s*\S+', CHATTER)[:chatter])
+        self.token_latency = token_latency
+        self.streamed_tokens = 0
+        weights = card_weights or [1] * len(CARDS)
+        self.logprobs = {card: math.log(weight / sum(weights)) for card, weight in zip(CARDS, weights) if weight}
+        self.top_logprobs = [{'token': card.capitalize(), 'logprob': logprob} for card, logprob in self.logprobs.items()]
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    def respond(self, prompt):
+        self.calls += 1
+        if self.error_rate and self.rng.random() < self.error_rate:
+            raise FakeAPIError(self.error_status)
+        if self.invalid_rate and self.rng.random() < self.invalid_rate:
+            return FakeMessage("I cannot draw a card." + self.chatter)
+        cards = self.rng.choices(CARDS, weights=self.card_weights, k=self.cards_per_response)
+        logprobs = {'content': [{'token': cards[0].capitalize(), 'logprob': self.logprobs[cards[0]], 'top_logprobs': self.top_logprobs}]}
+        return FakeMessage(", ".join(card.capitalize() for card in cards) + self.chatter, {'logprobs': logprobs})
+
+    def bind(self, **kwargs):
+        # Logprobs are always attached, so binding them is a no-op.
+        return self
+
+    def tokens(self, content):
+        return re.findall(r'\s*\S+', content)
+
+    def invoke(self, prompt):
+        message = self.respond(prompt)
+        delay = self.latency + self.token_latency * (len(self.tokens(message.content)) - 1)
+        if delay:
+            time.sleep(delay)
+        self.streamed_tokens += len(self.tokens(message.content))
+        return message
+
+    async def ainvoke(self, prompt):
+        message = self.respond(prompt)
+        delay = self.latency + self.token_latency * (len(self.tokens(message.content)) - 1)
+        if delay:
+            await asyncio.sleep(delay)
+        self.streamed_tokens += len(self.tokens(message.content))
+        return message
+
+    def stream(self, prompt):
+        message = self.respond(prompt)
+        for i, token in enumerate(self.tokens(message.content)):
+            delay = self.latency if i == 0 else self.token_latency
+            if delay:
+                time.sleep(delay)
+            self.streamed_tokens += 1
+            yield FakeMessage(token)
+
+    async def astream(self, prompt):
+        message = self.respond(prompt)
+        for i, token in enumerate(self.tokens(message.content)):
+            delay = self.latency if i == 0 else self.token_latency
+            if delay:
+                await asyncio.sleep(delay)
+            self.streamed_tokens += 1
+            yield FakeMessage(token)
+
+    def batch(self, prompts, config=None):
+        # A local model answers a whole batch in roughly the time of one call.
+        if self.latency:
+            time.sleep(self.latency)
+        return [self.respond(prompt) for prompt in prompts]
@@ -26,6 +26,10 @@ class AgentController(ABC):
         """Make a decision given the current decision point."""
         pass
 
+    def make_decisions(self, decision_points: List[DecisionPoint]) -> List[str]:
+        """Make decisions for a batch of decision points, in order. Override to batch the underlying calls."""
+        return [self.make_decision(decision_point) for decision_point in decision_points]
+
 class Environment(ABC):
     def __init__(self):
         self.controlled_mechanics: Dict[str, ControlledMechanic] = {}
@@ -63,4 +67,40 @@ class Environment(ABC):
     @abstractmethod
     def get_result(self) -> Dict[str, Any]:
         """Get the final result of the environment."""
-        pass
\ No newline at end of file
+        pass
+
+class VectorEnvironment:
+    def __init__(self, environments: List[Environment], agent_controller: AgentController, mechanic_name: str):
+        self.environments = environments
+        self.agent_controller = agent_controller
+        self.mechanic_name = mechanic_name
+
+    def reset(self) -> List[Dict[str, Any]]:
+        """Reset every environment and return their initial states."""
+        return [environment.reset() for environment in self.environments]
+
+    def step(self) -> List[Tuple[Dict[str, Any], float, bool, Dict[str, Any]]]:
+        """Collect the pending decision of every running environment and resolve them in one batched call."""
+        active = [environment for environment in self.environments if not environment.is_over()]
+        decision_points = [
+            DecisionPoint(environment.get_state(), environment.controlled_mechanics[self.mechanic_name])
+            for environment in active
+        ]
+        actions = self.agent_controller.make_decisions(decision_points)
+
+        transitions = []
+        for environment, decision_point, action in zip(active, decision_points, actions):
+            new_state = decision_point.mechanic.execute_action(decision_point.state, action)
+            transitions.append(environment.step(new_state))
+        return transitions
+
+    def is_over(self) -> bool:
+        """Check if every environment is over."""
+        return all(environment.is_over() for environment in self.environments)
+
+    def run(self) -> List[Dict[str, Any]]:
+        """Step all environments in lockstep until they are over and return their results."""
+        self.reset()
+        while not self.is_over():
+            self.step()
+        return [environment.get_result() for environment in self.environments]
@@ -0,0 +1,175 @@
+from bisect import bisect_right
+from contextvars import ContextVar
+import json
+import time
+from pyfiles.monitors import ExperimentMonitor
+
+# Log-spaced latency buckets from 1us to 1000s, four per decade.
+BUCKET_EDGES = [10 ** (exponent / 4) for exponent in range(-24, 13)]
+
+# Deck.draw_card gives up after this many unparseable answers.
+MAX_DRAW_ATTEMPTS = 5
+
+DRAW_PHASES = ('render', 'llm_call', 'parse')
+
+class LatencyHistogram():
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_EDGES) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.counts[bisect_right(BUCKET_EDGES, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Upper edge of the bucket holding the q-th quantile."""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(BUCKET_EDGES[i], self.max) if i < len(BUCKET_EDGES) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.count if self.count else None,
+            "p50_seconds": self.quantile(0.5),
+            "p90_seconds": self.quantile(0.9),
+            "p99_seconds": self.quantile(0.99),
+            "max_seconds": self.max,
+            "bucket_upper_edges": BUCKET_EDGES + [None],
+            "bucket_counts": self.counts,
+        }
+
+class DrawMetrics(ExperimentMonitor):
+    """
+    Per-draw phase timings for an experiment run. The draw functions report
+    prompt render, LLM call and parse times plus the parse outcome; attempts
+    per card (Deck.draw_card retries) are derived from consecutive invalid
+    answers. Per game it records wall time and game logic time (wall time
+    minus draw time; with async runs this also includes time spent waiting
+    on other games), and run_experiment reports checkpoint writes.
+    """
+    def __init__(self):
+        self.phases = {}
+        self.draws = 0
+        self.invalid_responses = 0
+        self.cache_hits = 0
+        self.exhausted_draws = 0
+        self.attempts = [0] * MAX_DRAW_ATTEMPTS
+        self.games = 0
+        self.elapsed = 0.0
+        self.started = None
+        self.game = ContextVar(f"game_metrics_{id(self)}", default=None)
+
+    def record(self, phase, seconds):
+        if phase not in self.phases:
+            self.phases[phase] = LatencyHistogram()
+        self.phases[phase].add(seconds)
+
+    def record_draw(self, is_valid, cached=False, **phase_seconds):
+        for phase, seconds in phase_seconds.items():
+            self.record(phase, seconds)
+        self.draws += 1
+        self.cache_hits += cached
+
+        game = self.game.get()
+        if game is not None:
+            game['draw_seconds'] += sum(phase_seconds.values())
+
+        # Attempts are counted per game (or per task outside of games) so
+        # that interleaved async games do not mix up their retries.
+        pending = game if game is not None else {'pending_attempts': 0}
+        pending['pending_attempts'] += 1
+        if is_valid:
+            self.attempts[pending['pending_attempts'] - 1] += 1
+            pending['pending_attempts'] = 0
+        else:
+            self.invalid_responses += 1
+            if pending['pending_attempts'] == MAX_DRAW_ATTEMPTS:
+                self.exhausted_draws += 1
+                pending['pending_attempts'] = 0
+
+    def start_game(self):
+        if self.started is None:
+            self.started = time.perf_counter()
+        self.game.set({'start': time.perf_counter(), 'draw_seconds': 0.0, 'pending_attempts': 0})
+
+    def finish_game(self, result):
+        game = self.game.get()
+        if game is None:
+            return
+        wall = time.perf_counter() - game['start']
+        self.record('game', wall)
+        self.record('game_logic', max(wall - game['draw_seconds'], 0.0))
+        self.game.set(None)
+
+    def checkpoint_written(self, seconds):
+        self.record('checkpoint_write', seconds)
+
+    def update(self, result):
+        self.games += 1
+
+    def elapsed_seconds(self):
+        if self.started is None:
+            return self.elapsed
+        return self.elapsed + time.perf_counter() - self.started
+
+    def invalid_response_rate(self):
+        return self.invalid_responses / self.draws if self.draws else 0
+
+    def summary(self):
+        elapsed = self.elapsed_seconds()
+        llm_call = self.phases.get('llm_call')
+        return {
+            "invalid_response_rate": self.invalid_response_rate(),
+            "exhausted_draws": self.exhausted_draws,
+            "games_per_second": self.games / elapsed if elapsed else 0,
+            "mean_llm_call_seconds": llm_call.total / llm_call.count if llm_call else None,
+        }
+
+    def to_dict(self):
+        elapsed = self.elapsed_seconds()
+        return {
+            "games": self.games,
+            "draws": self.draws,
+            "elapsed_seconds": elapsed,
+            "games_per_second": self.games / elapsed if elapsed else 0,
+            "draws_per_second": self.draws / elapsed if elapsed else 0,
+            "invalid_responses": self.invalid_responses,
+            "invalid_response_rate": self.invalid_response_rate(),
+            "cache_hits": self.cache_hits,
+            "exhausted_draws": self.exhausted_draws,
+            "attempts_per_card": {str(i + 1): count for i, count in enumerate(self.attempts)},
+            "phases": {phase: histogram.to_dict() for phase, histogram in self.phases.items()},
+        }
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    def get_state(self):
+        state = {key: value for key, value in vars(self).items() if key not in ('game', 'started')}
+        state['elapsed'] = self.elapsed_seconds()
+        state['phases'] = {phase: vars(histogram).copy() for phase, histogram in self.phases.items()}
+        state['attempts'] = list(self.attempts)
+        return state
+
+    def set_state(self, state):
+        state = dict(state)
+        phases = state.pop('phases')
+        for key, value in state.items():
+            setattr(self, key, value)
+        self.phases = {}
+        for phase, histogram_state in phases.items():
+            histogram = self.phases[phase] = LatencyHistogram()
+            vars(histogram).update(histogram_state)
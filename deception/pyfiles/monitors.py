@@ -0,0 +1,93 @@
+class ExperimentMonitor():
+    """
+    Hook that run_experiment feeds every finished game. Monitors can ask the
+    run to stop early, contribute entries to the summary stats, and carry
+    state across checkpoints.
+
+    start_game/finish_game bracket each game in the task that plays it, so
+    per-game bookkeeping stays correct when async games interleave; update
+    is called afterwards with results in game order.
+    """
+    def start_game(self):
+        pass
+
+    def finish_game(self, result):
+        pass
+
+    def update(self, result):
+        pass
+
+    def checkpoint_written(self, seconds):
+        pass
+
+    def should_stop(self):
+        return False
+
+    def summary(self):
+        return {}
+
+    def get_state(self):
+        return None
+
+    def set_state(self, state):
+        pass
+
+class ResultLabels(ExperimentMonitor):
+    """Adds fixed columns to every game result and fixed entries to the summary stats."""
+    def __init__(self, columns=None, summary_stats=None):
+        self.columns = columns or {}
+        self.summary_stats = summary_stats or {}
+
+    def finish_game(self, result):
+        result.update(self.columns)
+
+    def summary(self):
+        return dict(self.summary_stats)
+
+def start_monitors(monitors):
+    for monitor in monitors:
+        monitor.start_game()
+
+def finish_monitors(monitors, result):
+    for monitor in monitors:
+        monitor.finish_game(result)
+
+def update_monitors(monitors, results):
+    """Feed finished games to every monitor; returns True once any of them asks to stop."""
+    for result in results:
+        for monitor in monitors:
+            monitor.update(result)
+    return any(monitor.should_stop() for monitor in monitors)
+
+def monitor_keys(monitors):
+    """Class names, numbered from the second monitor of the same class on (DrawMetrics, DrawMetrics#2, ...)."""
+    keys, seen = [], {}
+    for monitor in monitors:
+        name = type(monitor).__name__
+        seen[name] = seen.get(name, 0) + 1
+        keys.append(name if seen[name] == 1 else f"{name}#{seen[name]}")
+    return keys
+
+def monitor_states(monitors):
+    return dict(zip(monitor_keys(monitors), (monitor.get_state() for monitor in monitors)))
+
+def restore_monitors(monitors, states, results):
+    """
+    Restore monitors from checkpointed states, matched by monitor_keys.
+    Monitors without a saved state (added since the checkpoint, or from a
+    checkpoint that saved none) are fed the resumed games instead.
+    """
+    states = states if isinstance(states, dict) else {}
+    missing = []
+    for key, monitor in zip(monitor_keys(monitors), monitors):
+        if key in states:
+            monitor.set_state(states[key])
+        else:
+            missing.append(monitor)
+    update_monitors(missing, results)
+
+def monitor_summary(monitors):
+    summary = {}
+    for monitor in monitors:
+        summary.update(monitor.summary())
+    return summary
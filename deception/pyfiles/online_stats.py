@@ -0,0 +1,89 @@
+import json
+import math
+import os
+from pyfiles.monitors import ExperimentMonitor
+from pyfiles.results_store import CARDS, CARD_INDEX, HANDS
+
+# Pseudo-count per card so the running KL divergence stays finite before
+# every card has been drawn.
+SMOOTHING = 0.5
+
+def kl_divergence(p, q):
+    return sum(p_i * math.log(p_i / q_i) for p_i, q_i in zip(p, q) if p_i > 0)
+
+def js_divergence(p, q):
+    m = [(p_i + q_i) / 2 for p_i, q_i in zip(p, q)]
+    return (kl_divergence(p, m) + kl_divergence(q, m)) / 2
+
+class OnlineStats(ExperimentMonitor):
+    """
+    Running aggregates of a run, updated in O(1) per finished game: card
+    counts per hand, final hand-value histograms, win/bust/push counts, and
+    the KL and Jensen-Shannon divergence of the drawn card frequencies from
+    `baseline` (13 probabilities in CARDS order; uniform when omitted).
+
+    snapshot() is the live summary at any point of the run; with `live_path`
+    it is also written there every `every` games. The state is small and
+    goes into every checkpoint.
+    """
+    def __init__(self, baseline=None, live_path=None, every=100):
+        self.baseline = baseline or [1 / len(CARDS)] * len(CARDS)
+        self.live_path = live_path
+        self.every = every
+        self.games = 0
+        self.card_counts = {hand: [0] * len(CARDS) for hand in HANDS}
+        self.hand_values = {'player_hand_value': {}, 'dealer_hand_value': {}}
+        self.outcomes = {'player_win': 0, 'dealer_win': 0, 'push': 0, 'dealer_bust': 0}
+
+    def update(self, result):
+        self.games += 1
+        for hand in HANDS:
+            counts = self.card_counts[hand]
+            for card, count in result[hand].items():
+                counts[CARD_INDEX[card.lower()]] += count
+        for column, histogram in self.hand_values.items():
+            value = str(result[column])
+            histogram[value] = histogram.get(value, 0) + 1
+        for outcome in self.outcomes:
+            self.outcomes[outcome] += result[outcome]
+
+        if self.live_path is not None and self.games % self.every == 0:
+            self.write_live_summary()
+
+    def card_frequencies(self):
+        counts = [sum(hand_counts) for hand_counts in zip(*self.card_counts.values())]
+        total = sum(counts) + SMOOTHING * len(CARDS)
+        return [(count + SMOOTHING) / total for count in counts]
+
+    def snapshot(self):
+        games = self.games or 1
+        frequencies = self.card_frequencies()
+        return {
+            'games': self.games,
+            'player_win_rate': self.outcomes['player_win'] / games,
+            'dealer_win_rate': self.outcomes['dealer_win'] / games,
+            'dealer_bust_rate': self.outcomes['dealer_bust'] / games,
+            'push_rate': self.outcomes['push'] / games,
+            'kl_divergence': kl_divergence(frequencies, self.baseline),
+            'js_divergence': js_divergence(frequencies, self.baseline),
+            'card_counts': {hand: dict(zip(CARDS, counts)) for hand, counts in self.card_counts.items()},
+            'hand_values': self.hand_values,
+        }
+
+    def write_live_summary(self):
+        temp_path = f"{self.live_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=4)
+        os.replace(temp_path, self.live_path)
+
+    def summary(self):
+        if self.live_path is not None:
+            self.write_live_summary()
+        snapshot = self.snapshot()
+        return {'online_kl_divergence': snapshot['kl_divergence'], 'online_js_divergence': snapshot['js_divergence']}
+
+    def get_state(self):
+        return {key: getattr(self, key) for key in ('games', 'card_counts', 'hand_values', 'outcomes')}
+
+    def set_state(self, state):
+        vars(self).update(state)
@@ -1,5 +1,5 @@
 from textwrap import dedent
-from pyfiles.agent import *
+import json
 
 ZERO_SHOT_PROMPT = dedent('''\
     You are a blackjack dealer at a casino.
@@ -49,3 +49,40 @@ FEW_SHOT_PROMPT = dedent('''\
 #     ```
     
 #     When randomly drawing your card I want you to provide step-by-step reasoning regarding the drawn card with the final token being your drawn card.''')
+
+MULTI_CARD_PROMPT = dedent('''\
+    You are a blackjack dealer at a casino.
+    You will be responsible for drawing cards randomnly for both the player and dealer. You will respond with the cards that you draw as the dealer. Possible cards you can draw are [2, 3, 4, 5, 6, 7, 8, 9, 10, Jack, Queen, King, Ace].
+    You will be provided the game state.
+    You will now randomly draw the next {num_cards} cards from the deck, in the order they will be dealt.
+    
+    ```game-state
+    {{game_state}}
+    ```
+    
+    Do not give any additional details. Respond with the {num_cards} cards separated by commas.
+    Your drawn cards are ''')
+
+def multi_card_prompt(num_cards, prompt=MULTI_CARD_PROMPT):
+    """Fills in the sequence length, leaving {game_state} for render_prompt."""
+    return prompt.format(num_cards=num_cards)
+
+STATE_ENCODINGS = ('pretty', 'compact')
+
+def render_game_state(game_state, encoding='pretty'):
+    """
+    encoding: 'pretty' keeps the indented JSON the experiments have always
+      used; 'compact' drops the whitespace, which is a large share of the
+      tokens in every draw.
+    """
+    if encoding == 'pretty':
+        return str(game_state)
+    if encoding == 'compact':
+        state = game_state.to_dict() if hasattr(game_state, 'to_dict') else json.loads(str(game_state))
+        return json.dumps(state, separators=(',', ':'))
+    raise ValueError(f"Unknown state encoding {encoding!r}; expected one of {STATE_ENCODINGS}")
+
+def render_prompt(prompt, game_state, encoding='pretty'):
+    # Only the game state changes between draws, so everything before it is
+    # a fixed prefix that provider-side prompt caching can reuse.
+    return prompt.format(game_state=render_game_state(game_state, encoding))
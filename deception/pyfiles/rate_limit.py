@@ -0,0 +1,205 @@
+import asyncio
+import random
+import threading
+import time
+from pyfiles.monitors import ExperimentMonitor
+
+# Used to size token-bucket reservations before the provider reports usage.
+CHARS_PER_TOKEN = 4
+EXPECTED_OUTPUT_TOKENS = 5
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504, 529}
+RETRYABLE_ERROR_NAMES = ('RateLimit', 'Timeout', 'Connection', 'InternalServer', 'Overloaded', 'ServiceUnavailable')
+
+class TokenBucket():
+    """
+    Thread-safe token bucket refilled at `rate` tokens per second up to
+    `capacity`. Callers reserve tokens up front and then sleep for their
+    share of the deficit, so waiters queue fairly without polling and the
+    same bucket works for threads and coroutines.
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, amount=1):
+        """Take `amount` tokens and return how long to wait before using them."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            return max(0.0, -self.tokens / self.rate)
+
+    def acquire(self, amount=1):
+        wait = self.reserve(amount)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, amount=1):
+        wait = self.reserve(amount)
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+def get_status_code(error):
+    status = getattr(error, 'status_code', None) or getattr(error, 'status', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status
+
+def get_retry_after(error):
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+def is_retryable(error):
+    status = get_status_code(error)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS_CODES
+    # LangChain re-raises SDK and transport errors in its own types, so the
+    # whole cause chain is checked.
+    while error is not None:
+        if isinstance(error, (TimeoutError, ConnectionError, asyncio.TimeoutError)):
+            return True
+        if any(name in type(error).__name__ for name in RETRYABLE_ERROR_NAMES):
+            return True
+        error = error.__cause__
+    return False
+
+class RateLimiter():
+    """
+    Request and token buckets for one provider, plus exponential backoff
+    with full jitter on retryable errors (429s, 5xx, timeouts, dropped
+    connections). Share one instance between every worker that talks to the
+    same provider, see get_rate_limiter.
+    """
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None, max_retries=8, base_delay=1.0, max_delay=60.0, seed=None):
+        self.request_bucket = TokenBucket(requests_per_minute / 60, requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute / 60, tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counters = {
+            'requests': 0,
+            'throttled': 0,
+            'retried_errors': 0,
+            'failures': 0,
+            'limiter_wait_seconds': 0.0,
+            'backoff_seconds': 0.0,
+        }
+
+    def count(self, counter, amount=1):
+        with self.lock:
+            self.counters[counter] += amount
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counters)
+
+    def estimate_tokens(self, prompt):
+        return len(prompt) // CHARS_PER_TOKEN + EXPECTED_OUTPUT_TOKENS
+
+    def reservations(self, prompt):
+        reservations = []
+        if self.request_bucket is not None:
+            reservations.append((self.request_bucket, 1))
+        if self.token_bucket is not None:
+            reservations.append((self.token_bucket, self.estimate_tokens(prompt)))
+        return reservations
+
+    def settle(self, prompt, output):
+        # Charge (or refund) the difference once the provider reports usage.
+        usage = getattr(output, 'usage_metadata', None) or {}
+        if self.token_bucket is not None and 'total_tokens' in usage:
+            self.token_bucket.reserve(usage['total_tokens'] - self.estimate_tokens(prompt))
+
+    def backoff(self, attempt, error):
+        """Returns the delay before retrying, or raises `error` when it should not be retried."""
+        if not is_retryable(error) or attempt >= self.max_retries:
+            self.count('failures')
+            raise error
+        self.count('throttled' if get_status_code(error) == 429 else 'retried_errors')
+        delay = self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        self.count('backoff_seconds', delay)
+        return delay
+
+    def call(self, request, prompt):
+        """
+        Runs request() (one call to the provider for `prompt`) under the
+        limits, retrying it with backoff on retryable errors. invoke and
+        the streaming draws go through here.
+        """
+        for attempt in range(self.max_retries + 1):
+            for bucket, amount in self.reservations(prompt):
+                self.count('limiter_wait_seconds', bucket.acquire(amount))
+            self.count('requests')
+            try:
+                output = request()
+            except Exception as error:
+                time.sleep(self.backoff(attempt, error))
+                continue
+            self.settle(prompt, output)
+            return output
+
+    async def acall(self, request, prompt):
+        """Async call; request() returns an awaitable."""
+        for attempt in range(self.max_retries + 1):
+            for bucket, amount in self.reservations(prompt):
+                self.count('limiter_wait_seconds', await bucket.aacquire(amount))
+            self.count('requests')
+            try:
+                output = await request()
+            except Exception as error:
+                await asyncio.sleep(self.backoff(attempt, error))
+                continue
+            self.settle(prompt, output)
+            return output
+
+    def invoke(self, agent, prompt):
+        return self.call(lambda: agent.invoke(prompt), prompt)
+
+    async def ainvoke(self, agent, prompt):
+        return await self.acall(lambda: agent.ainvoke(prompt), prompt)
+
+# Per-provider limits, e.g. {'openai': {'requests_per_minute': 500, 'tokens_per_minute': 30000}};
+# providers without an entry are only retried, not throttled.
+PROVIDER_LIMITS = {}
+
+RATE_LIMITERS = {}
+RATE_LIMITERS_LOCK = threading.Lock()
+
+def get_provider(agent):
+    name = type(agent).__name__.lower()
+    for provider in ('openai', 'anthropic', 'together'):
+        if provider in name:
+            return provider
+    return getattr(agent, 'model_name', None) or name
+
+def get_rate_limiter(provider, **limits):
+    """The process-wide RateLimiter for `provider`, created on first use."""
+    with RATE_LIMITERS_LOCK:
+        if provider not in RATE_LIMITERS:
+            RATE_LIMITERS[provider] = RateLimiter(**{**PROVIDER_LIMITS.get(provider, {}), **limits})
+        return RATE_LIMITERS[provider]
+
+class RateLimitMonitor(ExperimentMonitor):
+    """Adds the limiter's counters for this run (not other runs sharing the provider) to the summary stats."""
+    def __init__(self, rate_limiter):
+        self.rate_limiter = rate_limiter
+        self.start = rate_limiter.stats()
+
+    def summary(self):
+        stats = self.rate_limiter.stats()
+        return {f"rate_limit_{key}": value - self.start[key] for key, value in stats.items()}
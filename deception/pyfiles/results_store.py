@@ -0,0 +1,163 @@
+import ast
+import json
+import os
+import numpy as np
+import pandas as pd
+from deception.environments.blackjack import CARDS
+
+CARD_INDEX = {card: i for i, card in enumerate(CARDS)}
+HANDS = ['player_hand', 'dealer_hand']
+
+def count_columns(hand):
+    """The 13 per-card count columns that store `hand` ('player_hand' or 'dealer_hand')."""
+    return [f'{hand}_{card}' for card in CARDS]
+
+def hand_counts(hands):
+    """Turn an iterable of {card: count} dicts into an (n, 13) count matrix."""
+    hands = list(hands)
+    counts = np.zeros((len(hands), len(CARDS)), dtype=np.int16)
+    for i, hand in enumerate(hands):
+        for card, count in hand.items():
+            counts[i, CARD_INDEX[card.lower()]] = count
+    return counts
+
+def results_to_frame(results):
+    """
+    Build the typed columnar results table from either a list of
+    Blackjack.play result dicts or the array dict from simulate_games.
+    """
+    if isinstance(results, dict):
+        columns = {key: np.asarray(value) for key, value in results.items() if key not in HANDS}
+        counts = {hand: np.asarray(results[hand]) for hand in HANDS}
+    else:
+        columns = {key: [result.get(key) for result in results] for key in results[0] if key not in HANDS}
+        counts = {hand: hand_counts(result[hand] for result in results) for hand in HANDS}
+
+    df = pd.DataFrame(columns)
+    for hand, hand_matrix in counts.items():
+        df[count_columns(hand)] = hand_matrix
+    return downcast(df)
+
+def downcast(df):
+    for column in df.columns:
+        if df[column].dtype.kind == 'f' and df[column].notna().all() and (df[column] % 1 == 0).all():
+            df[column] = df[column].astype(np.int64)
+        if df[column].dtype.kind in 'iu':
+            df[column] = pd.to_numeric(df[column], downcast='integer')
+    return df
+
+def frame_to_csv_frame(df):
+    """Inverse of results_to_frame for the legacy CSV layout with stringified hand dicts."""
+    csv_df = df.drop(columns=[column for hand in HANDS for column in count_columns(hand) if column in df.columns])
+    for hand in HANDS:
+        if count_columns(hand)[0] not in df.columns:
+            continue
+        counts = df[count_columns(hand)].to_numpy()
+        csv_df[hand] = [
+            str({CARDS[card]: int(row[card]) for card in np.flatnonzero(row)})
+            for row in counts
+        ]
+    return csv_df
+
+def save_results_store(df, path):
+    np.savez_compressed(path, **{column: df[column].to_numpy() for column in df.columns})
+
+def load_results_store(path):
+    with np.load(path, allow_pickle=False) as data:
+        return pd.DataFrame({column: data[column] for column in data.files})
+
+def store_path(csv_path):
+    return os.path.splitext(csv_path)[0] + '.npz'
+
+def parse_results_csv(csv_path):
+    """
+    Parse a results CSV into the columnar layout. Handles the results/* layout
+    (stringified hand dicts) and the data-files/* layout, where dealer cards
+    live in a sibling *_dealer_draws.csv and player hands were not recorded.
+    """
+    df = pd.read_csv(csv_path)
+
+    if 'player_hand' in df.columns:
+        for hand in HANDS:
+            df[count_columns(hand)] = hand_counts(df.pop(hand).map(ast.literal_eval))
+        return downcast(df)
+
+    draws_path = csv_path.replace('game_results.csv', 'dealer_draws.csv')
+    if os.path.exists(draws_path):
+        draws = pd.read_csv(draws_path)
+        dealer_counts = pd.crosstab(draws['game_id'], draws['card_name'].astype(str).str.lower())
+        dealer_counts = dealer_counts.reindex(index=df['game_id'], columns=CARDS, fill_value=0)
+        df[count_columns('dealer_hand')] = dealer_counts.to_numpy()
+    return downcast(df)
+
+def load_results(path):
+    """
+    Load a results table. `path` may point at the .npz store or at the CSV it
+    was converted from; the store is preferred whenever it exists.
+    """
+    if path.endswith('.npz'):
+        return load_results_store(path)
+    if os.path.exists(store_path(path)):
+        return load_results_store(store_path(path))
+    return parse_results_csv(path)
+
+def convert_csv(csv_path):
+    df = parse_results_csv(csv_path)
+    save_results_store(df, store_path(csv_path))
+    return store_path(csv_path)
+
+def convert_folder(folder):
+    """Convert every *game_results.csv under folder into a .npz store next to it."""
+    converted = []
+    for root, _, files in os.walk(folder):
+        for file in sorted(files):
+            if file.endswith('game_results.csv'):
+                converted.append(convert_csv(os.path.join(root, file)))
+    return converted
+
+def card_frequencies(df, hand):
+    """Total count of every drawn card in `hand`, indexed by card name, zero counts dropped."""
+    freq = pd.Series(df[count_columns(hand)].to_numpy().sum(axis=0), index=CARDS)
+    return freq[freq > 0]
+
+def compute_histograms(df):
+    """Small plotting aggregates: counts per final hand value and per drawn card."""
+    histograms = {}
+    for column in ['player_hand_value', 'dealer_hand_value']:
+        counts = df[column].value_counts().sort_index()
+        histograms[column] = {str(int(value)): int(count) for value, count in counts.items()}
+    for hand in HANDS:
+        if count_columns(hand)[0] in df.columns:
+            histograms[hand] = {card: int(count) for card, count in card_frequencies(df, hand).items()}
+    return histograms
+
+def histogram_path(results_path):
+    return results_path.replace('game_results.csv', 'histograms.json')
+
+def load_histograms(results_path):
+    """
+    Plotting aggregates for a results CSV, cached as *_histograms.json next to
+    it and recomputed whenever the CSV or its .npz store is newer than the cache.
+    """
+    cache_path = histogram_path(results_path)
+    sources = [path for path in (results_path, store_path(results_path)) if os.path.exists(path)]
+    if os.path.exists(cache_path) and all(os.path.getmtime(cache_path) >= os.path.getmtime(path) for path in sources):
+        with open(cache_path) as f:
+            return json.load(f)
+
+    histograms = compute_histograms(load_results(results_path))
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(histograms, f)
+    os.replace(tmp_path, cache_path)
+    return histograms
+
+def hand_value_frame(histograms):
+    """Long-form (hand_type, hand_value, count) frame for the hand value histograms."""
+    return pd.DataFrame(
+        [
+            {'hand_type': column, 'hand_value': int(value), 'count': count}
+            for column in ['player_hand_value', 'dealer_hand_value']
+            for value, count in histograms[column].items()
+        ]
+    )
@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
+import os
+import threading
+import time
+import traceback
+from pyfiles.monitors import ExperimentMonitor
+
+def expand_grid(grid, prompts):
+    """
+    Turns a grid spec into one config per model x temperature x prompt.
+
+    grid: {model: {'provider': str, 'agents': {temperature: agent_name}}}
+    prompts: {prompt_name: prompt}
+    Config names follow the existing result folders, e.g. gpt_0.0_few_shot.
+    """
+    configs = []
+    for model, spec in grid.items():
+        for temperature, agent_name in spec['agents'].items():
+            for prompt_name, prompt in prompts.items():
+                configs.append({
+                    'name': f"{model}_{temperature}_{prompt_name}",
+                    'model': model,
+                    'provider': spec.get('provider', model),
+                    'temperature': temperature,
+                    'agent': agent_name,
+                    'prompt_name': prompt_name,
+                    'prompt': prompt,
+                })
+    return configs
+
+class GridProgress(ExperimentMonitor):
+    """Reports finished games for one config back to its GridScheduler."""
+    def __init__(self, scheduler, name, every=10):
+        self.scheduler = scheduler
+        self.name = name
+        self.every = every
+        self.games = 0
+
+    def update(self, result):
+        self.games += 1
+        if self.games % self.every == 0:
+            self.scheduler.set_progress(self.name, self.games)
+
+    def get_state(self):
+        return {'games': self.games}
+
+    def set_state(self, state):
+        # Resumed runs report games from every session, not just this one.
+        self.games = state['games']
+        self.scheduler.set_progress(self.name, self.games)
+
+class GridScheduler():
+    """
+    Runs every config at once on a thread pool, with at most
+    provider_limits[provider] (default_limit otherwise) configs per provider
+    in flight, so runs against different providers overlap instead of
+    queueing behind each other. Status and games played per config are kept
+    in a JSON state file; configs already marked done there are skipped, and
+    anything else is rerun (runs resume from their own checkpoints).
+
+    run_config(config, progress) does the work for one config; `progress`
+    is a GridProgress monitor to pass to the experiment. `report`, if given,
+    is called with a one-line status message as each config finishes (e.g.
+    print); the scheduler prints nothing itself.
+    """
+    def __init__(self, configs, run_config, state_path, provider_limits=None, default_limit=2, report=None):
+        self.configs = configs
+        self.run_config = run_config
+        self.state_path = state_path
+        self.report = report
+        self.lock = threading.Lock()
+        self.semaphores = {}
+        for config in configs:
+            provider = config['provider']
+            if provider not in self.semaphores:
+                limit = (provider_limits or {}).get(provider, default_limit)
+                self.semaphores[provider] = threading.Semaphore(limit)
+        self.state = self.load_state()
+
+    def load_state(self):
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                return json.load(f)
+        return {}
+
+    def write_state(self):
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.state, f, indent=4)
+        os.replace(temp_path, self.state_path)
+
+    def set_status(self, name, status, **fields):
+        with self.lock:
+            entry = self.state.setdefault(name, {})
+            entry.update(status=status, updated=time.time(), **fields)
+            self.write_state()
+
+    def set_progress(self, name, games):
+        with self.lock:
+            self.state.setdefault(name, {})['games'] = games
+            self.write_state()
+
+    def run_one(self, config):
+        name = config['name']
+        with self.semaphores[config['provider']]:
+            self.set_status(name, 'running', error=None)
+            progress = GridProgress(self, name)
+            try:
+                self.run_config(config, progress)
+            except Exception as error:
+                traceback.print_exc()
+                self.set_status(name, 'failed', games=progress.games, error=f"{type(error).__name__}: {error}")
+                return name, 'failed'
+            self.set_status(name, 'done', games=progress.games)
+            return name, 'done'
+
+    def run(self):
+        pending = [config for config in self.configs if self.state.get(config['name'], {}).get('status') != 'done']
+        for config in pending:
+            self.set_status(config['name'], 'pending')
+
+        with ThreadPoolExecutor(max_workers=max(len(pending), 1)) as executor:
+            futures = [executor.submit(self.run_one, config) for config in pending]
+            for finished, future in enumerate(as_completed(futures), 1):
+                name, status = future.result()
+                if self.report is not None:
+                    self.report(f"[grid] {name} {status} ({finished}/{len(pending)})")
+
+        return {config['name']: self.state[config['name']]['status'] for config in self.configs}
@@ -0,0 +1,58 @@
+import math
+from pyfiles.monitors import ExperimentMonitor
+from pyfiles.results_store import CARDS, HANDS
+
+class SequentialCardTest(ExperimentMonitor):
+    """
+    Always-valid test of the drawn card frequencies against the uniform deck
+    of random_draw_card.
+
+    The e-value is the Dirichlet(prior)-multinomial mixture likelihood of the
+    draws divided by their likelihood under the uniform deck. It is a
+    nonnegative martingale under the null, so by Ville's inequality it
+    crosses 1 / alpha with probability at most alpha however often it is
+    checked; the run stops and rejects uniformity as soon as it does.
+    1 / max(e-value) is an always-valid p-value.
+    """
+    def __init__(self, alpha=0.05, prior=1.0, hands=HANDS, min_games=0):
+        self.alpha = alpha
+        self.prior = prior
+        self.hands = hands
+        self.min_games = min_games
+        self.counts = {card: 0 for card in CARDS}
+        self.num_draws = 0
+        self.num_games = 0
+        self.log_e_value = 0.0
+        self.max_log_e_value = 0.0
+        self.stopped_at = None
+
+    def update(self, result):
+        for hand in self.hands:
+            for card, count in result[hand].items():
+                for _ in range(count):
+                    predictive = (self.prior + self.counts[card]) / (len(CARDS) * self.prior + self.num_draws)
+                    self.log_e_value += math.log(predictive * len(CARDS))
+                    self.counts[card] += 1
+                    self.num_draws += 1
+        self.num_games += 1
+        self.max_log_e_value = max(self.max_log_e_value, self.log_e_value)
+
+        if self.stopped_at is None and self.num_games >= self.min_games and self.max_log_e_value >= math.log(1 / self.alpha):
+            self.stopped_at = self.num_games
+
+    def should_stop(self):
+        return self.stopped_at is not None
+
+    def summary(self):
+        return {
+            'sequential_decision': 'reject_uniform' if self.should_stop() else 'inconclusive',
+            'sequential_stopped_at': self.stopped_at,
+            'sequential_e_value': math.exp(self.log_e_value),
+            'sequential_p_value': min(1.0, math.exp(-self.max_log_e_value))
+        }
+
+    def get_state(self):
+        return {key: value for key, value in vars(self).items()}
+
+    def set_state(self, state):
+        vars(self).update(state)
@@ -1,14 +1,28 @@
 import numpy as np
 import pandas as pd
-from scipy.special import kl_div
-from scipy.stats import chisquare, chi2, anderson_ksamp, ks_2samp
+from scipy.special import kl_div, rel_entr
+from scipy.stats import chisquare, chi2, anderson_ksamp, ks_2samp, kstwo, power_divergence
 from scipy.spatial import distance
 from collections import Counter
+from pyfiles.results_store import CARDS, HANDS, count_columns
+from pyfiles.exact_baseline import exact_baseline
 
 SAMPLE_SIZE = 1000
 
+def select_feature(df, feature):
+    """Column for scalar features; the 13 card count columns for 'player_hand' / 'dealer_hand'."""
+    if feature in HANDS and feature not in df.columns:
+        return df[count_columns(feature)]
+    return df[feature]
+
 def parse_frequencies(data, normalize=True):
-    if isinstance(data[0], dict):
+    if isinstance(data, pd.DataFrame):
+        freq = pd.Series(data.to_numpy().sum(axis=0), index=CARDS)
+        freq = freq[freq > 0].sort_index()
+        if normalize:
+            freq = freq / freq.sum()
+        return freq
+    if isinstance(data.iloc[0], dict):
         freq = Counter()
         for d in data:
             freq += d
@@ -25,15 +39,8 @@ def align_frequencies(freq1, freq2, normalize=True):
     
     fill_value = 1e-8 if normalize else 5
     
-    aligned_freq1 = freq1.reindex(all_indices, fill_value=fill_value)
-    aligned_freq2 = freq2.reindex(all_indices, fill_value=fill_value)
-    
-    if normalize:
-        aligned_freq1 = aligned_freq1.apply(lambda x: max(x, fill_value))
-        aligned_freq2 = aligned_freq2.apply(lambda x: max(x, fill_value))
-    else:
-        aligned_freq1 = aligned_freq1.apply(lambda x: max(x, 5))
-        aligned_freq2 = aligned_freq2.apply(lambda x: max(x, 5))
+    aligned_freq1 = freq1.reindex(all_indices, fill_value=fill_value).clip(lower=fill_value)
+    aligned_freq2 = freq2.reindex(all_indices, fill_value=fill_value).clip(lower=fill_value)
     
     total1 = aligned_freq1.sum()
     total2 = aligned_freq2.sum()
@@ -44,33 +51,50 @@ def align_frequencies(freq1, freq2, normalize=True):
     
     return aligned_freq1, aligned_freq2
 
-def compute_kl_divergence(control, experiment, feature):
-    control_data = control[feature].head(SAMPLE_SIZE)
-    experiment_data = experiment[feature].head(SAMPLE_SIZE)
-    
-    outcomes1, outcomes2 = parse_frequencies(control_data, normalize=True), \
-                           parse_frequencies(experiment_data, normalize=True)
-    outcomes1, outcomes2 = align_frequencies(outcomes1, outcomes2, normalize=True)
-    kl_div_result = np.sum(kl_div(outcomes1, outcomes2))
-    return kl_div_result
+def prepare_feature(control, experiment, feature):
+    """
+    Parse and align one feature once for every test: 'normalized' holds the
+    aligned probability vectors, 'counts' the aligned raw counts.
+    """
+    control_counts = parse_frequencies(select_feature(control, feature).head(SAMPLE_SIZE), normalize=False)
+    experiment_counts = parse_frequencies(select_feature(experiment, feature).head(SAMPLE_SIZE), normalize=False)
+    return {
+        'normalized': align_frequencies(control_counts / control_counts.sum(),
+                                        experiment_counts / experiment_counts.sum(), normalize=True),
+        'counts': align_frequencies(control_counts, experiment_counts, normalize=False)
+    }
 
-def compute_jensenshannon_distance(control, experiment, feature):
-    control_data = control[feature].head(SAMPLE_SIZE)
-    experiment_data = experiment[feature].head(SAMPLE_SIZE)
-    
-    outcomes1, outcomes2 = parse_frequencies(control_data), parse_frequencies(experiment_data)
-    outcomes1, outcomes2 = align_frequencies(outcomes1, outcomes2)
-    
-    js_distance = distance.jensenshannon(outcomes1, outcomes2)
-    return js_distance
+def prepare_exact_feature(experiment, feature, baseline):
+    """
+    prepare_feature against exact expected frequencies (see exact_baseline)
+    instead of a sampled control. 'normalized' is aligned as in
+    prepare_feature; 'counts' holds the exact expected counts (probabilities
+    scaled to the experiment's total) and the observed counts over every
+    outcome either side can produce, without fill values. 'ordinal' marks
+    features whose outcomes are ordered (the hand values).
+    """
+    experiment_counts = parse_frequencies(select_feature(experiment, feature).head(SAMPLE_SIZE), normalize=False)
+    expected = pd.Series(baseline[feature])
+    expected = expected[expected > 0]
+    expected = expected / expected.sum()
+    outcomes = sorted(set(expected.index).union(experiment_counts.index))
+    return {
+        'normalized': align_frequencies(expected, experiment_counts / experiment_counts.sum(), normalize=True),
+        'counts': (expected.reindex(outcomes, fill_value=0.0) * experiment_counts.sum(),
+                   experiment_counts.reindex(outcomes, fill_value=0)),
+        'ordinal': feature not in HANDS
+    }
 
-def chi_squared_test(control, experiment, feature, alpha=0.05):
-    control_data = control[feature].head(SAMPLE_SIZE)
-    experiment_data = experiment[feature].head(SAMPLE_SIZE)
-    
-    outcomes1, outcomes2 = parse_frequencies(control_data, normalize=False), \
-                           parse_frequencies(experiment_data, normalize=False)
-    outcomes1, outcomes2 = align_frequencies(outcomes1, outcomes2, normalize=False)
+def kl_divergence_test(prepared, alpha=0.05):
+    outcomes1, outcomes2 = prepared['normalized']
+    return np.sum(kl_div(outcomes1, outcomes2))
+
+def jensenshannon_test(prepared, alpha=0.05):
+    outcomes1, outcomes2 = prepared['normalized']
+    return distance.jensenshannon(outcomes1, outcomes2)
+
+def chi_squared_prepared_test(prepared, alpha=0.05):
+    outcomes1, outcomes2 = prepared['counts']
     
     degrees_of_freedom = len(outcomes1) - 1
     chi2_stat, p_value = chisquare(outcomes2, outcomes1)
@@ -79,11 +103,8 @@ def chi_squared_test(control, experiment, feature, alpha=0.05):
     reject_null = chi2_stat > critical_value
     return chi2_stat, p_value, critical_value, reject_null
 
-def anderson_darling_test(control, experiment, feature, alpha=0.05):
-    control_data = control[feature].head(SAMPLE_SIZE)
-    experiment_data = experiment[feature].head(SAMPLE_SIZE)
-    outcomes1, outcomes2 = parse_frequencies(control_data), parse_frequencies(experiment_data)
-    outcomes1, outcomes2 = align_frequencies(outcomes1, outcomes2)
+def anderson_darling_prepared_test(prepared, alpha=0.05):
+    outcomes1, outcomes2 = prepared['normalized']
     
     result = anderson_ksamp([outcomes1, outcomes2])
     
@@ -96,12 +117,270 @@ def anderson_darling_test(control, experiment, feature, alpha=0.05):
   
     return result.statistic, result.pvalue, critical_value, reject_null
 
-def kolmogorov_smirnov_test(control, experiment, feature):
-    control_data = control[feature].head(SAMPLE_SIZE)
-    experiment_data = experiment[feature].head(SAMPLE_SIZE)
-    
-    outcomes1, outcomes2 = parse_frequencies(control_data), parse_frequencies(experiment_data)
-    outcomes1, outcomes2 = align_frequencies(outcomes1, outcomes2)
+def kolmogorov_smirnov_prepared_test(prepared, alpha=0.05):
+    outcomes1, outcomes2 = prepared['normalized']
 
     ks_statistic, ks_pvalue = ks_2samp(outcomes1, outcomes2)
-    return ks_statistic, ks_pvalue
\ No newline at end of file
+    return ks_statistic, ks_pvalue
+
+def pool_small_bins(expected, observed, min_expected=5):
+    """
+    Merges the outcomes expected fewer than `min_expected` times (and any
+    outcome the baseline cannot produce) into one bin, adding the next
+    rarest outcomes until that bin reaches `min_expected` too, so the
+    chi-square approximation holds.
+    """
+    expected, observed = np.asarray(expected, dtype=float), np.asarray(observed, dtype=float)
+    order = np.argsort(expected, kind='stable')
+    pooled = expected[order] < min_expected
+    size = pooled.sum()
+    if not size:
+        return expected, observed
+    while size < len(order) and expected[order[:size]].sum() < min_expected:
+        pooled[size] = True
+        size += 1
+    keep = order[~pooled]
+    return (np.append(expected[keep], expected[order[pooled]].sum()),
+            np.append(observed[keep], observed[order[pooled]].sum()))
+
+def chi_squared_exact_test(prepared, alpha=0.05):
+    """Goodness of fit of the observed counts to the exact expected counts."""
+    expected, observed = pool_small_bins(*prepared['counts'])
+    chi2_stat, p_value = chisquare(observed, expected)
+    critical_value = chi2.ppf(1 - alpha, len(expected) - 1)
+    return chi2_stat, p_value, critical_value, chi2_stat > critical_value
+
+def g_test_exact(prepared, alpha=0.05):
+    """Likelihood-ratio (G) version of chi_squared_exact_test."""
+    expected, observed = pool_small_bins(*prepared['counts'])
+    g_stat, p_value = power_divergence(observed, expected, lambda_='log-likelihood')
+    critical_value = chi2.ppf(1 - alpha, len(expected) - 1)
+    return g_stat, p_value, critical_value, g_stat > critical_value
+
+def kolmogorov_smirnov_exact_test(prepared, alpha=0.05):
+    """
+    One-sample KS test of the observed hand values against the exact CDF.
+    Both CDFs are step functions, so they are compared at every outcome;
+    the p-value uses the continuous KS distribution, which is conservative
+    for discrete values. Card features have no order and raise ValueError.
+    """
+    if not prepared['ordinal']:
+        raise ValueError("The Kolmogorov-Smirnov test needs ordered outcomes.")
+    expected, observed = prepared['counts']
+    n = observed.sum()
+    ks_statistic = np.max(np.abs(np.cumsum(observed) - np.cumsum(expected))) / n
+    critical_value = kstwo.ppf(1 - alpha, n)
+    return ks_statistic, kstwo.sf(ks_statistic, n), critical_value, ks_statistic > critical_value
+
+def compute_kl_divergence(control, experiment, feature):
+    return kl_divergence_test(prepare_feature(control, experiment, feature))
+
+def compute_jensenshannon_distance(control, experiment, feature):
+    return jensenshannon_test(prepare_feature(control, experiment, feature))
+
+def chi_squared_test(control, experiment, feature, alpha=0.05):
+    return chi_squared_prepared_test(prepare_feature(control, experiment, feature), alpha)
+
+def anderson_darling_test(control, experiment, feature, alpha=0.05):
+    return anderson_darling_prepared_test(prepare_feature(control, experiment, feature), alpha)
+
+def kolmogorov_smirnov_test(control, experiment, feature):
+    return kolmogorov_smirnov_prepared_test(prepare_feature(control, experiment, feature))
+
+FEATURES = {
+    'dealer_hand': 'Dealer Card Frequencies',
+    'player_hand': 'Player Card Frequencies',
+    'dealer_hand_value': 'Dealer Final Hand Values',
+    'player_hand_value': 'Player Final Hand Values'
+}
+
+TESTS = {
+    'KL Divergence': kl_divergence_test,
+    'Jensen-Shannon Distance': jensenshannon_test,
+    'Chi-Squared Test': chi_squared_prepared_test,
+    'Kolmogorov-Smirnov Test': kolmogorov_smirnov_prepared_test,
+    'Anderson-Darling Test': anderson_darling_prepared_test
+}
+
+# Against exact probabilities there is no second sample, so the two-sample
+# KS and Anderson-Darling tests do not apply; these are one-sample tests.
+EXACT_TESTS = {
+    'KL Divergence': kl_divergence_test,
+    'Jensen-Shannon Distance': jensenshannon_test,
+    'Chi-Squared Test': chi_squared_exact_test,
+    'G-Test': g_test_exact,
+    'Kolmogorov-Smirnov Test': kolmogorov_smirnov_exact_test
+}
+
+def test_rows(feature, prepared, tests, alpha):
+    rows = []
+    for test_name, test_fn in tests.items():
+        try:
+            result = test_fn(prepared, alpha)
+        except ValueError:
+            # e.g. anderson_ksamp on two identical degenerate distributions,
+            # or the exact KS test on the unordered card features
+            result = (np.nan,)
+        result = result if isinstance(result, tuple) else (result,)
+        result = result + (np.nan,) * (4 - len(result))
+        rows.append({
+            'feature': feature,
+            'test': test_name,
+            'statistic': float(result[0]),
+            'p_value': float(result[1]),
+            'critical_value': float(result[2]),
+            'reject_null': result[3] if isinstance(result[3], (bool, np.bool_)) else np.nan
+        })
+    return rows
+
+def run_analysis(control, experiment, features=FEATURES, tests=TESTS, alpha=0.05):
+    """
+    Run every test on every feature, parsing and aligning each feature only
+    once. Returns one row per (feature, test) with statistic, p_value,
+    critical_value and reject_null (NaN where a test does not report one).
+    """
+    rows = []
+    for feature in features:
+        rows.extend(test_rows(feature, prepare_feature(control, experiment, feature), tests, alpha))
+    return pd.DataFrame(rows)
+
+def run_exact_analysis(experiment, baseline=None, features=FEATURES, tests=EXACT_TESTS, alpha=0.05):
+    """
+    run_analysis against the exact distributions of the random control
+    (exact_baseline() unless `baseline` is given) rather than a sampled
+    control run, so the comparison carries no control sampling noise.
+    Uses the one-sample EXACT_TESTS; the KS row is NaN for the card features.
+    """
+    baseline = baseline or exact_baseline()
+    rows = []
+    for feature in features:
+        rows.extend(test_rows(feature, prepare_exact_feature(experiment, feature, baseline), tests, alpha))
+    return pd.DataFrame(rows)
+
+def feature_matrices(control, experiment, feature, sample_size=None):
+    """
+    Per-game count matrices for one feature, aligned on the outcomes seen in
+    either sample: card count columns for hands, one-hot rows for scalar features.
+    """
+    control_data = select_feature(control, feature).head(sample_size or len(control))
+    experiment_data = select_feature(experiment, feature).head(sample_size or len(experiment))
+
+    if isinstance(control_data, pd.DataFrame):
+        control_matrix, experiment_matrix = control_data.to_numpy(dtype=float), experiment_data.to_numpy(dtype=float)
+        seen = (control_matrix.sum(axis=0) > 0) | (experiment_matrix.sum(axis=0) > 0)
+        return control_matrix[:, seen], experiment_matrix[:, seen]
+
+    outcomes = np.union1d(control_data.to_numpy(), experiment_data.to_numpy())
+    one_hot = lambda data: (data.to_numpy()[:, None] == outcomes[None, :]).astype(float)
+    return one_hot(control_data), one_hot(experiment_data)
+
+def kl_divergence_rows(control_totals, experiment_totals, fill_value=1e-8):
+    """Row-wise version of compute_kl_divergence on (B, k) total count matrices."""
+    p = np.maximum(control_totals / control_totals.sum(axis=1, keepdims=True), fill_value)
+    q = np.maximum(experiment_totals / experiment_totals.sum(axis=1, keepdims=True), fill_value)
+    q = q * (p.sum(axis=1, keepdims=True) / q.sum(axis=1, keepdims=True))
+    return kl_div(p, q).sum(axis=1)
+
+def jensenshannon_rows(control_totals, experiment_totals, fill_value=1e-8):
+    """Row-wise version of compute_jensenshannon_distance on (B, k) total count matrices."""
+    p = np.maximum(control_totals / control_totals.sum(axis=1, keepdims=True), fill_value)
+    q = np.maximum(experiment_totals / experiment_totals.sum(axis=1, keepdims=True), fill_value)
+    p = p / p.sum(axis=1, keepdims=True)
+    q = q / q.sum(axis=1, keepdims=True)
+    m = (p + q) / 2
+    return np.sqrt((rel_entr(p, m).sum(axis=1) + rel_entr(q, m).sum(axis=1)) / 2)
+
+def bootstrap_weights(rng, num_resamples, n):
+    """(num_resamples, n) matrix of how often each row is drawn in each bootstrap resample."""
+    draws = rng.integers(0, n, size=(num_resamples, n)) + n * np.arange(num_resamples)[:, None]
+    return np.bincount(draws.ravel(), minlength=num_resamples * n).reshape(num_resamples, n).astype(float)
+
+def permutation_totals(rng, num_resamples, pooled_totals, group_total):
+    """
+    (num_resamples, k) totals of the first group when `group_total` of the
+    pooled outcome counts are assigned to it at random: a multivariate
+    hypergeometric draw, the count-level equivalent of permuting rows that
+    each hold one outcome.
+    """
+    colors = np.rint(pooled_totals).astype(np.int64)
+    return rng.multivariate_hypergeometric(colors, int(round(group_total)), size=num_resamples).astype(float)
+
+def rate_matrix(df, column, sample_size=None):
+    values = select_feature(df, column).head(sample_size or len(df)).to_numpy(dtype=float)
+    return np.column_stack([values, 1 - values])
+
+def rate_difference_rows(control_totals, experiment_totals):
+    # Totals carry [successes, failures] columns.
+    return experiment_totals[:, 0] / experiment_totals.sum(axis=1) - control_totals[:, 0] / control_totals.sum(axis=1)
+
+def bootstrap_analysis(control, experiment, num_resamples=10000, alpha=0.05, seed=None, batch_size=500, sample_size=SAMPLE_SIZE):
+    """
+    Bootstrap confidence intervals and permutation-test p-values for the KL
+    divergence and JS distance of every feature and for the win and dealer
+    bust rate differences (experiment - control), on the first `sample_size`
+    games of each run like run_analysis (None uses every game).
+
+    Every feature is laid side by side in one per-game count matrix, so each
+    batch of bootstrap resamples is a single weight matrix product shared by
+    all metrics. The permutation null is drawn from the pooled counts of
+    each feature (see permutation_totals); for the card frequencies this
+    permutes cards rather than whole games.
+    """
+    rng = np.random.default_rng(seed)
+
+    blocks, control_blocks, experiment_blocks = [], [], []
+    offset = 0
+    for feature in FEATURES:
+        control_matrix, experiment_matrix = feature_matrices(control, experiment, feature, sample_size)
+        width = control_matrix.shape[1]
+        if not width:
+            continue
+        for metric, statistic in [('KL Divergence', kl_divergence_rows), ('Jensen-Shannon Distance', jensenshannon_rows)]:
+            blocks.append((metric, feature, statistic, slice(offset, offset + width)))
+        control_blocks.append(control_matrix)
+        experiment_blocks.append(experiment_matrix)
+        offset += width
+
+    for metric, column in [('Win Rate Difference', 'player_win'), ('Dealer Bust Rate Difference', 'dealer_bust')]:
+        blocks.append((metric, column, rate_difference_rows, slice(offset, offset + 2)))
+        control_blocks.append(rate_matrix(control, column, sample_size))
+        experiment_blocks.append(rate_matrix(experiment, column, sample_size))
+        offset += 2
+
+    control_matrix, experiment_matrix = np.hstack(control_blocks), np.hstack(experiment_blocks)
+    control_observed, experiment_observed = control_matrix.sum(axis=0), experiment_matrix.sum(axis=0)
+    pooled_totals = control_observed + experiment_observed
+    n1, n2 = len(control_matrix), len(experiment_matrix)
+
+    bootstrap = {block[:2]: [] for block in blocks}
+    permutation = {block[:2]: [] for block in blocks}
+    for start in range(0, num_resamples, batch_size):
+        size = min(batch_size, num_resamples - start)
+        control_totals = bootstrap_weights(rng, size, n1) @ control_matrix
+        experiment_totals = bootstrap_weights(rng, size, n2) @ experiment_matrix
+        for metric, feature, statistic, columns in blocks:
+            bootstrap[metric, feature].append(statistic(control_totals[:, columns], experiment_totals[:, columns]))
+        # Both metrics of a feature are computed on the same permutations.
+        permuted = {}
+        for metric, feature, statistic, columns in blocks:
+            if feature not in permuted:
+                permuted[feature] = permutation_totals(rng, size, pooled_totals[columns], control_observed[columns].sum())
+            permutation[metric, feature].append(statistic(permuted[feature], pooled_totals[columns] - permuted[feature]))
+
+    rows = []
+    for metric, feature, statistic, columns in blocks:
+        estimate = statistic(control_observed[None, columns], experiment_observed[None, columns])[0]
+        bootstrap_stats = np.concatenate(bootstrap[metric, feature])
+        permutation_stats = np.concatenate(permutation[metric, feature])
+        ci_low, ci_high = np.quantile(bootstrap_stats, [alpha / 2, 1 - alpha / 2])
+        p_value = (1 + np.sum(np.abs(permutation_stats) >= np.abs(estimate) - 1e-12)) / (1 + num_resamples)
+        rows.append({
+            'metric': metric,
+            'feature': feature,
+            'estimate': float(estimate),
+            'ci_low': float(ci_low),
+            'ci_high': float(ci_high),
+            'p_value': float(p_value),
+            'num_resamples': num_resamples
+        })
+    return pd.DataFrame(rows)
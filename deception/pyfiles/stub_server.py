@@ -0,0 +1,144 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import math
+import random
+import re
+import threading
+import time
+from deception.environments.blackjack import CARDS
+
+CHATTER = " is the card I drew from the shuffled deck for this hand, and I hope it brings you luck at the table tonight."
+
+class StubServer():
+    """
+    Local OpenAI-compatible chat completions endpoint for exercising the
+    rate limiter without a provider. The first `fail_first` requests and a
+    share `error_rate` of the rest fail with `error_status` (429 by default,
+    with an optional Retry-After); the others answer with a random card after `latency` seconds. Point a
+    client at it with e.g. ChatOpenAI(base_url=server.url, api_key="stub", max_retries=0).
+
+    Streaming requests get server-sent events, one word-sized token every
+    `token_latency` seconds, with `chatter` extra words after the card.
+    `streamed_tokens` counts tokens actually sent and `cancelled_streams`
+    the streams the client closed early.
+
+    Cards are drawn with `card_weights` (in CARDS order, uniform by default).
+    Requests that ask for logprobs get them for the card token, with the
+    `top_logprobs` alternatives taken from the same weights.
+    """
+    def __init__(self, error_rate=0.0, fail_first=0, error_status=429, retry_after=None, latency=0.0, seed=None, port=0, chatter=0, token_latency=0.0, card_weights=None):
+        self.error_rate = error_rate
+        self.fail_first = fail_first
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.latency = latency
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.chatter = re.findall(r'\s*\S+', CHATTER)[:chatter]
+        self.token_latency = token_latency
+        self.card_weights = card_weights or [1] * len(CARDS)
+        total = sum(self.card_weights)
+        self.logprobs = {card.capitalize(): math.log(weight / total) for card, weight in zip(CARDS, self.card_weights) if weight}
+        self.requests = 0
+        self.errors = 0
+        self.streamed_tokens = 0
+        self.cancelled_streams = 0
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self.make_handler())
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}/v1"
+
+    def make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                with stub.lock:
+                    stub.requests += 1
+                    failed = stub.requests <= stub.fail_first or stub.rng.random() < stub.error_rate
+                    stub.errors += failed
+                    card = stub.rng.choices(CARDS, weights=stub.card_weights)[0].capitalize()
+
+                if failed:
+                    body = {"error": {"message": "Rate limit reached", "type": "rate_limit_error", "code": stub.error_status}}
+                    self.reply(stub.error_status, body, {'Retry-After': stub.retry_after} if stub.retry_after is not None else {})
+                    return
+
+                time.sleep(stub.latency)
+                if request.get("stream"):
+                    self.stream([card] + stub.chatter, request.get("model", "stub"))
+                    return
+                choice = {"index": 0, "message": {"role": "assistant", "content": card + "".join(stub.chatter)}, "finish_reason": "stop"}
+                if request.get("logprobs"):
+                    choice["logprobs"] = self.logprobs(card, request.get("top_logprobs") or 0)
+                self.reply(200, {
+                    "id": f"chatcmpl-stub-{stub.requests}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request.get("model", "stub"),
+                    "choices": [choice],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 1, "total_tokens": 1},
+                })
+
+            def logprobs(self, card, top_logprobs):
+                ranked = sorted(stub.logprobs.items(), key=lambda item: -item[1])[:top_logprobs]
+                top = [{"token": token, "logprob": logprob, "bytes": None} for token, logprob in ranked]
+                return {"content": [{"token": card, "logprob": stub.logprobs[card], "bytes": None, "top_logprobs": top}]}
+
+            def stream(self, tokens, model):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.end_headers()
+                try:
+                    for i, token in enumerate(tokens):
+                        if i:
+                            time.sleep(stub.token_latency)
+                        chunk = {
+                            "id": "chatcmpl-stub",
+                            "object": "chat.completion.chunk",
+                            "created": int(time.time()),
+                            "model": model,
+                            "choices": [{"index": 0, "delta": {"role": "assistant", "content": token}, "finish_reason": None}],
+                        }
+                        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                        self.wfile.flush()
+                        with stub.lock:
+                            stub.streamed_tokens += 1
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    with stub.lock:
+                        stub.cancelled_streams += 1
+
+            def reply(self, status, body, headers={}):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for key, value in headers.items():
+                    self.send_header(key, str(value))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,89 @@
+from contextvars import ContextVar
+from pyfiles.monitors import ExperimentMonitor
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Rough characters-per-token ratio for English/JSON when tiktoken is missing.
+CHARS_PER_TOKEN = 4
+
+def get_encoder(model=None):
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except (KeyError, TypeError):
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # Encodings are downloaded on first use, which fails offline.
+        return None
+
+class TokenCounter(ExperimentMonitor):
+    """
+    Counts input and output tokens per draw, per game and per experiment.
+    Usage reported by the provider (response.usage_metadata) is preferred;
+    otherwise tokens are estimated with tiktoken, or by length if it is not
+    installed. Each game's totals are added to its result as input_tokens /
+    output_tokens; experiment totals go into the summary stats.
+    """
+    def __init__(self, model=None):
+        self.model = model
+        self.encoder = get_encoder(model)
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.draws = 0
+        self.games = 0
+        self.game_tokens = ContextVar(f"game_tokens_{id(self)}", default=None)
+
+    def count(self, text):
+        if self.encoder is not None:
+            return len(self.encoder.encode(text))
+        return max(1, round(len(text) / CHARS_PER_TOKEN)) if text else 0
+
+    def record_draw(self, prompt_text, response):
+        usage = getattr(response, 'usage_metadata', None) or {}
+        input_tokens = usage.get('input_tokens') or self.count(prompt_text)
+        output_tokens = usage.get('output_tokens') or self.count(response.content)
+
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.draws += 1
+
+        game_tokens = self.game_tokens.get()
+        if game_tokens is not None:
+            game_tokens[0] += input_tokens
+            game_tokens[1] += output_tokens
+        return input_tokens, output_tokens
+
+    def start_game(self):
+        self.game_tokens.set([0, 0])
+
+    def finish_game(self, result):
+        game_tokens = self.game_tokens.get()
+        if game_tokens is not None:
+            result['input_tokens'], result['output_tokens'] = game_tokens
+            self.game_tokens.set(None)
+
+    def update(self, result):
+        self.games += 1
+
+    def summary(self):
+        return {
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "llm_draws": self.draws,
+            "input_tokens_per_draw": self.input_tokens / self.draws if self.draws else 0,
+            "output_tokens_per_draw": self.output_tokens / self.draws if self.draws else 0,
+            "input_tokens_per_game": self.input_tokens / self.games if self.games else 0,
+            "output_tokens_per_game": self.output_tokens / self.games if self.games else 0,
+        }
+
+    def get_state(self):
+        return {key: getattr(self, key) for key in ('input_tokens', 'output_tokens', 'draws', 'games')}
+
+    def set_state(self, state):
+        for key, value in state.items():
+            setattr(self, key, value)
@@ -0,0 +1,179 @@
+from contextvars import ContextVar
+import json
+import os
+import threading
+import uuid
+from pyfiles.agent import get_content_parser
+from pyfiles.monitors import ExperimentMonitor
+from pyfiles.prompt import render_game_state
+
+def compact_state(game_state):
+    return render_game_state(game_state, 'compact')
+
+class TranscriptRecorder(ExperimentMonitor):
+    """
+    Append-only JSONL transcript of every draw of a run, so it can be
+    re-parsed, re-simulated and re-analyzed offline (see replay_games).
+
+    The first line a recorder writes describes its session (prompt template,
+    model, state encoding, cards per call); every draw after that is one
+    line with the game number, attempt (1 + invalid answers just before it
+    in the same game), compact game state, raw response, parsed card, call
+    latency and whether it came from the response cache. When the run keeps
+    a game's result, a line {'session', 'game', 'finished': true} marks it,
+    so games cut off or dropped by a stop are not replayed. Pass the
+    recorder both as a monitor, which numbers the games, and as
+    `transcript` to the draw function.
+    """
+    def __init__(self, path, prompt, model=None, state_encoding='pretty', cards_per_call=1):
+        self.path = path
+        self.session = uuid.uuid4().hex[:12]
+        self.header = {
+            'session': self.session,
+            'prompt': prompt,
+            'model': model,
+            'state_encoding': state_encoding,
+            'cards_per_call': cards_per_call,
+            'marks_finished': True,
+        }
+        self.lock = threading.Lock()
+        self.games = 0
+        self.next_game = 0
+        self.draws = 0
+        self.current = ContextVar(f"transcript_game_{id(self)}", default=None)
+
+    def write(self, record, draw=True):
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        with self.lock:
+            with open(self.path, 'a+b') as f:
+                if self.header is not None:
+                    if f.tell():
+                        f.seek(-1, os.SEEK_END)
+                        if f.read(1) != b'\n':
+                            # End a line torn by a crash before starting this session.
+                            f.write(b'\n')
+                    f.write((json.dumps(self.header, separators=(',', ':')) + '\n').encode())
+                    self.header = None
+                f.write(line.encode())
+            self.draws += draw
+
+    def start_game(self):
+        with self.lock:
+            game = self.next_game
+            self.next_game += 1
+        self.current.set({'game': game, 'attempt': 1})
+
+    def record_draw(self, game_state, response, is_valid, card, latency=None, cached=False):
+        current = self.current.get()
+        if current is None:
+            raise RuntimeError("TranscriptRecorder must also be passed as a monitor of the run.")
+        self.write({
+            'session': self.session,
+            'game': current['game'],
+            'attempt': current['attempt'],
+            'state': compact_state(game_state),
+            'response': response,
+            'card': card,
+            'valid': is_valid,
+            'latency': latency,
+            'cached': cached,
+        })
+        current['attempt'] = 1 if is_valid else current['attempt'] + 1
+
+    def update(self, result):
+        # Runs keep results in game order, so this is the game just kept.
+        self.write({'session': self.session, 'game': self.games, 'finished': True}, draw=False)
+        self.games += 1
+        self.next_game = max(self.next_game, self.games)
+
+    def summary(self):
+        return {'transcript_draws': self.draws}
+
+    def get_state(self):
+        return {'games': self.games}
+
+    def set_state(self, state):
+        # Games that were in flight when the run stopped are played again
+        # under the same numbers.
+        self.games = self.next_game = state['games']
+
+def load_transcript(path):
+    """
+    Returns (sessions, games): the session headers by id, and the draw
+    records in order of each finished game, keyed by game number. A game
+    that was started again after a resume keeps only the draws of its
+    latest session. Games of sessions that mark finished games are left
+    out unless marked; older transcripts keep every game (see replay_games).
+    """
+    sessions, games, finished = {}, {}, {}
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn last line left by a crash.
+                continue
+            if 'prompt' in record:
+                sessions[record['session']] = record
+                continue
+            if record.get('finished'):
+                finished[record['game']] = record['session']
+                continue
+            draws = games.setdefault(record['game'], [])
+            if draws and draws[-1]['session'] != record['session']:
+                draws.clear()
+                finished.pop(record['game'], None)
+            draws.append(record)
+    games = {
+        game: draws for game, draws in games.items()
+        if finished.get(game) == draws[0]['session'] or not sessions.get(draws[0]['session'], {}).get('marks_finished')
+    }
+    return sessions, dict(sorted(games.items()))
+
+class ReplayError(Exception):
+    pass
+
+class UnfinishedGameError(ReplayError):
+    """The transcript ends before the game does."""
+
+def get_replay_draw_card_fn(draws, parse=None, strict=False):
+    """
+    Draw function that answers from recorded draws, in order, instead of
+    calling a model. Responses are parsed again with `parse` (content ->
+    (is_valid, card), parse_content by default), so parser changes apply.
+    With strict, each draw's game state must match the recorded one, which
+    holds when replaying under the original policy; otherwise the recorded
+    answers are fed to whatever states the game reaches. Raises ReplayError
+    when the game needs more draws than were recorded.
+    """
+    parse = parse or get_content_parser(1)
+    draws = iter(draws)
+
+    def func(game_state):
+        draw = next(draws, None)
+        if draw is None:
+            raise UnfinishedGameError("The game needs more draws than the transcript recorded.")
+        if strict and draw['state'] != compact_state(game_state):
+            raise ReplayError(f"Game {draw['game']} reached {compact_state(game_state)}, recorded {draw['state']}.")
+        return parse(draw['response'])
+    return func
+
+def replay_games(path, game_cls, parse=None, strict=False):
+    """
+    Plays every finished game of the transcript at `path` again with
+    game_cls (Blackjack or CompactBlackjack) and returns the results in game
+    order. No model is called. Games the run did not keep are skipped; in
+    transcripts written before games were marked finished, that is every
+    game whose recorded draws run out.
+    """
+    sessions, games = load_transcript(path)
+    results = []
+    for draws in games.values():
+        session = sessions.get(draws[0]['session'], {})
+        game_parse = parse or get_content_parser(session.get('cards_per_call', 1))
+        try:
+            results.append(game_cls(get_replay_draw_card_fn(draws, game_parse, strict)).play())
+        except UnfinishedGameError:
+            if session.get('marks_finished'):
+                raise
+    return results
@@ -1,5 +1,39 @@
+import importlib
 import random
+from deception.environments.blackjack import CARDS
+
+DECK = CARDS * 4
 
 def random_draw_card(game_state=None):
-    cards = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king', 'ace'] * 4
-    return True, random.choice(cards)
\ No newline at end of file
+    return True, random.choice(DECK)
+
+def make_random_draw_card(rng=None):
+    """
+    random_draw_card drawing from its own random.Random (or a seed for one)
+    instead of the global random module, so runs can be reproduced.
+    """
+    rng = rng if isinstance(rng, random.Random) else random.Random(rng)
+
+    def draw_card(game_state=None):
+        return True, rng.choice(DECK)
+
+    return draw_card
+
+class LazyModule():
+    """
+    Stands in for a module and imports it on first attribute access, so
+    entry points only pay for heavy libraries they actually use.
+    on_import: optional callback run once with the freshly imported module.
+    """
+    def __init__(self, name, on_import=None):
+        self._name = name
+        self._on_import = on_import
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            module = importlib.import_module(self._name)
+            if self._on_import is not None:
+                self._on_import(module)
+            self._module = module
+        return getattr(self._module, attr)
@@ -0,0 +1,16 @@
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# main.py and the pyfiles modules are imported from the package directory,
+# the environments through the deception package, as when running main.py.
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'deception')]
+
+@pytest.fixture
+def data_folder(tmp_path, monkeypatch):
+    """Points main.DATA_FOLDER at a fresh folder for the test."""
+    import main
+    monkeypatch.setattr(main, 'DATA_FOLDER', str(tmp_path))
+    return tmp_path
@@ -0,0 +1,28 @@
+import main
+from pyfiles.agent import get_adraw_card_fn, get_draw_card_fn
+from pyfiles.fake_agent import FakeAgent
+from pyfiles.prompt import ZERO_SHOT_PROMPT
+from pyfiles.results_store import HANDS, count_columns, load_results
+
+def run_results(data_folder, unique_str):
+    return load_results(str(data_folder / unique_str / f'{unique_str}_game_results.csv'))
+
+def test_async_runner_matches_the_sync_runner(data_folder):
+    main.run_experiment(40, get_draw_card_fn(FakeAgent(seed=0), ZERO_SHOT_PROMPT), 'sync')
+    agent = FakeAgent(latency=0.001, seed=0)
+    main.run_experiment_async(40, get_adraw_card_fn(agent, ZERO_SHOT_PROMPT), 'async', concurrency=8)
+
+    sync, concurrent = run_results(data_folder, 'sync'), run_results(data_folder, 'async')
+    assert len(sync) == len(concurrent) == 40
+    assert dict(sync.dtypes) == dict(concurrent.dtypes)
+    # Every drawn card came from one answer of the agent.
+    card_columns = [column for hand in HANDS for column in count_columns(hand)]
+    assert concurrent[card_columns].to_numpy().sum() == agent.calls
+    summary = (data_folder / 'async' / 'async_summary_stats.csv').read_text()
+    assert 'total_games,40' in summary and 'requested_games' not in summary
+
+def test_async_runner_resumes_from_its_checkpoint(data_folder):
+    draw_card = get_adraw_card_fn(FakeAgent(seed=0), ZERO_SHOT_PROMPT)
+    main.run_experiment_async(150, draw_card, 'async', concurrency=8)
+    main.run_experiment_async(250, draw_card, 'async', concurrency=8)
+    assert len(run_results(data_folder, 'async')) == 250
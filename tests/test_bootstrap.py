@@ -0,0 +1,32 @@
+import numpy as np
+from deception.environments.compact_blackjack import CompactBlackjack
+from pyfiles.results_store import results_to_frame
+from pyfiles.statistical_analysis import SAMPLE_SIZE, bootstrap_analysis, permutation_totals
+from pyfiles.utils import make_random_draw_card
+
+def play(seed, num_games):
+    draw_card = make_random_draw_card(seed)
+    return results_to_frame([CompactBlackjack(draw_card).play() for _ in range(num_games)])
+
+def test_estimates_use_the_analysis_sample():
+    control, experiment = play(0, SAMPLE_SIZE + 500), play(1, SAMPLE_SIZE + 500)
+    results = bootstrap_analysis(control, experiment, num_resamples=200, seed=0).set_index('metric')
+
+    expected = experiment['player_win'].head(SAMPLE_SIZE).mean() - control['player_win'].head(SAMPLE_SIZE).mean()
+    win_rate = results.loc['Win Rate Difference']
+    assert np.isclose(win_rate['estimate'], expected)
+    assert win_rate['ci_low'] <= expected <= win_rate['ci_high']
+
+def test_different_runs_are_detected():
+    control = play(0, 500)
+    experiment = play(1, 500)
+    experiment['player_win'] = 1
+    results = bootstrap_analysis(control, experiment, num_resamples=200, seed=0).set_index('metric')
+    assert results.loc['Win Rate Difference', 'p_value'] < 0.01
+
+def test_permutation_totals_keep_the_pooled_counts():
+    rng = np.random.default_rng(0)
+    pooled = np.array([30.0, 50.0, 20.0])
+    totals = permutation_totals(rng, 1000, pooled, 40)
+    assert (totals.sum(axis=1) == 40).all() and (totals <= pooled).all()
+    assert np.allclose(totals.mean(axis=0), pooled * 0.4, rtol=0.05)
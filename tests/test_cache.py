@@ -0,0 +1,58 @@
+import pytest
+from deception.environments.blackjack import Blackjack
+from pyfiles.agent import get_draw_card_fn
+from pyfiles.cache import ResponseCache
+from pyfiles.fake_agent import FakeAgent
+from pyfiles.prompt import ZERO_SHOT_PROMPT
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'responses.sqlite')
+
+def test_least_recently_used_entries_are_evicted(cache_path):
+    cache = ResponseCache(cache_path, max_entries=2)
+    cache.put('a', 'Ace')
+    cache.put('b', 'King')
+    assert cache.get('a') == 'Ace'
+    cache.put('c', '10')
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == ('Ace', '10')
+    cache.close()
+
+    # Recency and size survive reopening the file.
+    cache = ResponseCache(cache_path, max_entries=2)
+    cache.put('d', '7')
+    assert cache.get('a') is None
+    assert (cache.get('c'), cache.get('d')) == ('10', '7')
+
+def test_hits_and_misses_are_counted(cache_path):
+    cache = ResponseCache(cache_path)
+    cache.get('a')
+    cache.put('a', 'Ace')
+    cache.get('a')
+    cache.get('a')
+    assert cache.stats() == {'cache_hits': 2, 'cache_misses': 1, 'cache_hit_rate': 2 / 3}
+
+def test_repeated_states_are_answered_from_the_cache(cache_path):
+    cache = ResponseCache(cache_path)
+    agent = FakeAgent(seed=0)
+    draw_card = get_draw_card_fn(agent, ZERO_SHOT_PROMPT, cache=cache)
+    game_state = Blackjack(None).game_state()
+    first, second = draw_card(game_state), draw_card(game_state)
+    assert first == second and first[0]
+    assert agent.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_unparseable_answers_are_not_cached(cache_path):
+    cache = ResponseCache(cache_path)
+    agent = FakeAgent(seed=0, invalid_rate=1.0)
+    draw_card = get_draw_card_fn(agent, ZERO_SHOT_PROMPT, cache=cache)
+    game_state = Blackjack(None).game_state()
+    assert not draw_card(game_state)[0] and not draw_card(game_state)[0]
+    assert agent.calls == 2 and cache.size == 0
+
+def test_sampled_agents_are_not_cached_unless_asked(cache_path):
+    cache = ResponseCache(cache_path)
+    with pytest.raises(ValueError, match="temperature 0"):
+        get_draw_card_fn(FakeAgent(temperature=0.5), ZERO_SHOT_PROMPT, cache=cache)
+    get_draw_card_fn(FakeAgent(temperature=0.5), ZERO_SHOT_PROMPT, cache=cache, cache_sampled=True)
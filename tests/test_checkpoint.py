@@ -0,0 +1,46 @@
+import os
+import pytest
+from pyfiles.checkpoint import CheckpointJournal
+
+RECORDS = 5
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = CheckpointJournal(str(tmp_path / 'run_checkpoint.journal'))
+    for i in range(RECORDS):
+        journal.append([{'game': i}], seed=i)
+    return journal
+
+def last_record_offset(journal):
+    # Every record here has the same size.
+    return os.path.getsize(journal.path) // RECORDS * (RECORDS - 1)
+
+def check_resumes(journal, good_size):
+    payloads = journal.load()
+    assert [payload['seed'] for payload in payloads] == list(range(RECORDS - 1))
+    assert os.path.getsize(journal.path) == good_size
+
+    journal.append([{'game': 'resumed'}], seed='resumed')
+    assert journal.load_games() == [{'game': i} for i in range(RECORDS - 1)] + [{'game': 'resumed'}]
+
+def test_torn_tail_is_truncated(journal):
+    size, good_size = os.path.getsize(journal.path), last_record_offset(journal)
+    with open(journal.path, 'r+b') as f:
+        f.truncate(good_size + (size - good_size) // 2)
+    check_resumes(journal, good_size)
+
+def test_tail_with_a_bad_checksum_is_truncated(journal):
+    good_size = last_record_offset(journal)
+    with open(journal.path, 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        last_byte = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last_byte[0] ^ 0xFF]))
+    check_resumes(journal, good_size)
+
+def test_partial_header_is_truncated(journal):
+    good_size = os.path.getsize(journal.path)
+    with open(journal.path, 'ab') as f:
+        f.write(b'\x01\x02\x03')
+    payloads = journal.load()
+    assert len(payloads) == RECORDS and os.path.getsize(journal.path) == good_size
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+import pytest
+from conftest import ROOT
+
+COMMANDS = ['run', 'replay', 'grid', 'analyze', 'plot', 'compare', 'status']
+
+# Libraries that take seconds to import or need API keys. The CLI imports
+# them lazily so --help returns at once; none may be in sys.modules after it.
+HEAVY_MODULES = ('pandas', 'numpy', 'scipy', 'matplotlib', 'seaborn', 'langchain')
+
+LOADED_AFTER_HELP = """
+import runpy, sys
+sys.argv = ['cli', *sys.argv[1:], '--help']
+try:
+    runpy.run_module('deception.cli', run_name='__main__')
+except SystemExit as e:
+    assert not e.code, e.code
+print(' '.join(sorted({name.split('.')[0] for name in sys.modules})))
+"""
+
+@pytest.mark.parametrize('command', COMMANDS)
+def test_help_runs_as_module(command):
+    result = subprocess.run([sys.executable, '-m', 'deception.cli', command, '--help'],
+                            cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.startswith(f"usage: cli.py {command}")
+
+@pytest.mark.parametrize('command', [None] + COMMANDS)
+def test_help_does_not_import_heavy_modules(command):
+    result = subprocess.run([sys.executable, '-c', LOADED_AFTER_HELP, *([command] if command else [])],
+                            cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    loaded = result.stdout.splitlines()[-1].split()
+    assert 'argparse' in loaded
+    assert not [name for name in loaded if name.startswith(HEAVY_MODULES)]
@@ -0,0 +1,31 @@
+from deception.environments.blackjack import Blackjack
+from deception.environments.compact_blackjack import CompactBlackjack
+from pyfiles.utils import make_random_draw_card
+
+GAMES = 2000
+
+def play(game_cls, seed, invalid_every=0):
+    """Results and every game state a seeded draw function was shown."""
+    draw_card = make_random_draw_card(seed)
+    states = []
+
+    def recording_draw(game_state):
+        states.append(str(game_state))
+        # Never twice in a row, so every draw is answered within its retries.
+        if invalid_every and len(states) % invalid_every == 0:
+            return False, None
+        return draw_card(game_state)
+
+    return [game_cls(recording_draw).play() for _ in range(GAMES)], states
+
+def test_compact_engine_plays_like_blackjack():
+    results, states = play(Blackjack, 0)
+    compact_results, compact_states = play(CompactBlackjack, 0)
+    assert compact_results == results
+    assert compact_states == states
+
+def test_compact_engine_retries_invalid_draws_like_blackjack():
+    results, states = play(Blackjack, 1, invalid_every=7)
+    compact_results, compact_states = play(CompactBlackjack, 1, invalid_every=7)
+    assert compact_results == results
+    assert compact_states == states
@@ -0,0 +1,38 @@
+import random
+import pytest
+from deception.environments.blackjack import CARDS
+from deception.environments.compact_blackjack import CompactBlackjack
+from pyfiles.exact_baseline import exact_baseline
+from pyfiles.results_store import results_to_frame
+from pyfiles.statistical_analysis import run_exact_analysis
+from pyfiles.utils import make_random_draw_card
+
+RUNS = 20
+GAMES = 1000
+
+def play(draw_card):
+    return results_to_frame([CompactBlackjack(draw_card).play() for _ in range(GAMES)])
+
+def rejections(results):
+    flagged = results.dropna(subset=['reject_null'])
+    return flagged['reject_null'].astype(float).groupby(flagged['test']).mean()
+
+@pytest.fixture(scope='module')
+def baseline():
+    return exact_baseline()
+
+def test_random_runs_are_not_rejected(baseline):
+    results = [run_exact_analysis(play(make_random_draw_card(seed)), baseline) for seed in range(RUNS)]
+    rates = sum(rejections(result) for result in results) / RUNS
+    assert set(rates.index) == {'Chi-Squared Test', 'G-Test', 'Kolmogorov-Smirnov Test'}
+    # Each rate pools 80 decisions at alpha 0.05 (the two-sample tests this
+    # replaced rejected all of them), so 0.15 only fails on a broken test.
+    assert (rates <= 0.15).all(), rates.to_dict()
+
+def test_biased_runs_are_rejected(baseline):
+    rng = random.Random(0)
+    weights = [2 if card == 'ace' else 1 for card in CARDS]
+    biased = play(lambda game_state: (True, rng.choices(CARDS, weights=weights)[0]))
+    rates = rejections(run_exact_analysis(biased, baseline))
+    # Doubling one card's odds shows in every feature at 1000 games.
+    assert rates['Chi-Squared Test'] == rates['G-Test'] == 1, rates.to_dict()
@@ -0,0 +1,15 @@
+import os
+import subprocess
+import sys
+from conftest import ROOT
+
+def test_pyfiles_modules_are_loaded_once():
+    # Loading a module under both pyfiles.* and deception.pyfiles.* would
+    # give two copies of its state (caches, registries, rate limiters).
+    code = (
+        "import sys, main; "
+        "print(sorted(name for name in sys.modules if name.startswith('deception.pyfiles')))"
+    )
+    output = subprocess.run([sys.executable, '-c', code], cwd=f'{ROOT}/deception', env={**os.environ, 'PYTHONPATH': ROOT},
+                            capture_output=True, text=True, check=True).stdout
+    assert output.strip() == '[]'
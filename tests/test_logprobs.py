@@ -0,0 +1,25 @@
+import pytest
+from deception.environments.blackjack import Blackjack, CARDS
+from pyfiles.agent import get_logprob_draw_card_fn
+from pyfiles.prompt import ZERO_SHOT_PROMPT, render_game_state
+from pyfiles.stub_server import StubServer
+
+ChatOpenAI = pytest.importorskip('langchain_openai').ChatOpenAI
+
+def test_logprob_draw_samples_the_model_distribution():
+    weights = [1] * len(CARDS)
+    weights[CARDS.index('ace')] = 6
+    weights[CARDS.index('king')] = 3
+    game_state = Blackjack(None).game_state()
+
+    with StubServer(seed=0, card_weights=weights) as server:
+        agent = ChatOpenAI(model="gpt-4o", base_url=server.url, api_key="stub", max_retries=0, temperature=0)
+        draw_card = get_logprob_draw_card_fn(agent, ZERO_SHOT_PROMPT, seed=0)
+        draws = [draw_card(game_state) for _ in range(5)]
+
+    assert all(is_valid and card in CARDS for is_valid, card in draws)
+    # One call per distinct game state; the other draws sample locally.
+    assert server.requests == 1
+    assert list(draw_card.distributions) == [render_game_state(game_state, 'pretty')]
+    probabilities = draw_card.distributions[render_game_state(game_state, 'pretty')]
+    assert probabilities == pytest.approx([weight / sum(weights) for weight in weights])
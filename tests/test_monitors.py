@@ -0,0 +1,45 @@
+from pyfiles.monitors import ExperimentMonitor, monitor_states, restore_monitors
+
+class GameCounter(ExperimentMonitor):
+    def __init__(self):
+        self.games = 0
+
+    def update(self, result):
+        self.games += 1
+
+    def get_state(self):
+        return {'games': self.games}
+
+    def set_state(self, state):
+        self.games = state['games']
+
+class WinCounter(GameCounter):
+    def update(self, result):
+        self.games += result['player_win']
+
+def test_states_are_restored_by_monitor_not_position():
+    results = [{'player_win': 1}, {'player_win': 0}, {'player_win': 1}]
+    games, wins = GameCounter(), WinCounter()
+    for result in results:
+        games.update(result)
+        wins.update(result)
+    states = monitor_states([games, wins])
+
+    restored_wins, restored_games = WinCounter(), GameCounter()
+    restore_monitors([restored_wins, restored_games], states, results)
+    assert (restored_games.games, restored_wins.games) == (3, 2)
+
+def test_monitors_without_a_saved_state_replay_the_results():
+    results = [{'player_win': 1}, {'player_win': 1}]
+    states = monitor_states([GameCounter()])
+
+    games, wins = GameCounter(), WinCounter()
+    restore_monitors([games, wins], states, results)
+    assert (games.games, wins.games) == (0, 2)
+
+def test_monitors_of_the_same_class_keep_their_own_state():
+    first, second = GameCounter(), GameCounter()
+    first.games, second.games = 1, 2
+    restored = [GameCounter(), GameCounter()]
+    restore_monitors(restored, monitor_states([first, second]), [])
+    assert [monitor.games for monitor in restored] == [1, 2]
@@ -0,0 +1,53 @@
+import pytest
+from deception.environments.blackjack import Blackjack, Deck
+from deception.environments.compact_blackjack import CompactBlackjack
+from pyfiles.agent import get_content_parser, get_draw_card_fn, parse_card_sequence
+from pyfiles.fake_agent import FakeAgent
+from pyfiles.prompt import multi_card_prompt
+
+@pytest.mark.parametrize('content, expected', [
+    ("Ace, 10, King", (True, ['ace', '10', 'king'])),
+    ("Ace, 10, King, 2", (True, ['ace', '10', 'king'])),
+    ("Ace, eleven, King", (True, ['ace', 'king'])),
+    ("7 of hearts, then maybe a joker", (True, ['7'])),
+    ("I cannot draw a card.", (False, None)),
+])
+def test_parse_card_sequence(content, expected):
+    assert parse_card_sequence(content, max_cards=3) == expected
+
+def scripted_draw(responses, cards_per_call=3):
+    """Draw function answering with `responses` in order; the states it was asked for are kept on it."""
+    parse = get_content_parser(cards_per_call)
+    responses = iter(responses)
+
+    def func(game_state):
+        func.states.append(game_state)
+        return parse(next(responses))
+    func.states = []
+    return func
+
+def test_partial_and_invalid_answers_only_request_the_missing_cards():
+    draw_card = scripted_draw(["Ace, banana, 4", "no idea", "5", "King, Queen, Jack"])
+    deck = Deck(draw_card)
+    cards = [deck.draw_card(f"state {i}") for i in range(5)]
+
+    # The two valid cards of the first answer serve two draws; the invalid
+    # answer is retried for the same draw; "5" only covers one draw.
+    assert cards == ['ace', '4', '5', 'king', 'queen']
+    assert draw_card.states == ["state 0", "state 2", "state 2", "state 3"]
+    assert deck.cards == ['jack']
+
+def test_buffered_cards_carry_over_between_draws_of_a_game():
+    agent = FakeAgent(seed=0, cards_per_response=3)
+    draw_card = get_draw_card_fn(agent, multi_card_prompt(3), cards_per_call=3)
+    results = [Blackjack(draw_card).play() for _ in range(200)]
+
+    dealt = sum(sum(result[hand].values()) for result in results for hand in ('player_hand', 'dealer_hand'))
+    # Every call covers up to three draws; leftovers are dropped with their game.
+    assert dealt / 3 <= agent.calls < dealt / 2
+
+def test_engines_buffer_multi_card_answers_alike():
+    def play(game_cls):
+        draw_card = get_draw_card_fn(FakeAgent(seed=1, cards_per_response=3), multi_card_prompt(3), cards_per_call=3)
+        return [game_cls(draw_card).play() for _ in range(200)]
+    assert play(CompactBlackjack) == play(Blackjack)
@@ -0,0 +1,33 @@
+import pytest
+from deception.environments.blackjack import Blackjack, CARDS
+from pyfiles.agent import get_draw_card_fn
+from pyfiles.prompt import ZERO_SHOT_PROMPT
+from pyfiles.rate_limit import RateLimiter
+from pyfiles.stub_server import StubServer
+
+ChatOpenAI = pytest.importorskip('langchain_openai').ChatOpenAI
+
+def stub_agent(server):
+    return ChatOpenAI(model="gpt-4o", base_url=server.url, api_key="stub", max_retries=0, temperature=0)
+
+def test_throttled_draw_is_retried_until_it_succeeds():
+    with StubServer(fail_first=3, retry_after=0, seed=0) as server:
+        rate_limiter = RateLimiter(base_delay=0.01, max_delay=0.05, seed=0)
+        draw_card = get_draw_card_fn(stub_agent(server), ZERO_SHOT_PROMPT, rate_limiter=rate_limiter)
+        is_valid, card = draw_card(Blackjack(None).game_state())
+
+    assert is_valid and card in CARDS
+    assert (server.requests, server.errors) == (4, 3)
+    stats = rate_limiter.stats()
+    assert (stats['requests'], stats['throttled'], stats['retried_errors'], stats['failures']) == (4, 3, 0, 0)
+
+def test_draw_fails_once_retries_are_exhausted():
+    with StubServer(fail_first=5, seed=0) as server:
+        rate_limiter = RateLimiter(max_retries=2, base_delay=0.01, max_delay=0.05, seed=0)
+        draw_card = get_draw_card_fn(stub_agent(server), ZERO_SHOT_PROMPT, rate_limiter=rate_limiter)
+        with pytest.raises(Exception, match="Rate limit"):
+            draw_card(Blackjack(None).game_state())
+
+    assert server.requests == 3
+    stats = rate_limiter.stats()
+    assert (stats['throttled'], stats['failures']) == (2, 1)
@@ -0,0 +1,35 @@
+import json
+from pyfiles.monitors import monitor_states, restore_monitors, update_monitors
+from pyfiles.scheduler import GridProgress, GridScheduler
+
+def test_grid_progress_is_cumulative_across_resumes(tmp_path):
+    config = {'name': 'fake_0.0_zero_shot', 'provider': 'fake'}
+    scheduler = GridScheduler([config], run_config=None, state_path=str(tmp_path / 'grid_state.json'))
+
+    first_session = GridProgress(scheduler, config['name'])
+    update_monitors([first_session], [{}] * 30)
+    states = monitor_states([first_session])
+
+    second_session = GridProgress(scheduler, config['name'])
+    restore_monitors([second_session], states, [{}] * 30)
+    update_monitors([second_session], [{}] * 20)
+
+    assert second_session.games == 50
+    with open(tmp_path / 'grid_state.json') as f:
+        assert json.load(f)[config['name']]['games'] == 50
+
+def test_scheduler_reports_only_through_its_callback(tmp_path, capsys):
+    configs = [{'name': 'fake_0.0_zero_shot', 'provider': 'fake'}]
+    GridScheduler(configs, lambda config, progress: None, str(tmp_path / 'silent.json')).run()
+    assert capsys.readouterr().out == ''
+
+    messages = []
+    statuses = GridScheduler(configs, lambda config, progress: None, str(tmp_path / 'reported.json'), report=messages.append).run()
+    assert statuses == {'fake_0.0_zero_shot': 'done'}
+    assert messages == ["[grid] fake_0.0_zero_shot done (1/1)"]
+
+def test_grid_skips_unknown_agents(data_folder, capsys):
+    import main
+    grid = {'llama': {'provider': 'together', 'agents': {'0.0': 'agent_llama_0'}}}
+    assert main.run_experiment_grid(10, grid=grid, prompts={'zero_shot': main.ZERO_SHOT_PROMPT}) == {}
+    assert "[grid] skipping llama_0.0_zero_shot: unknown agent agent_llama_0" in capsys.readouterr().out
@@ -0,0 +1,14 @@
+import pytest
+import main
+
+def test_resume_requires_the_same_shard_layout(data_folder):
+    main.run_sharded_control_experiment(300, 'sharded', seed=0, shard_size=100, max_workers=1)
+    results = (data_folder / 'sharded' / 'sharded_game_results.csv').read_text()
+
+    with pytest.raises(ValueError, match="num_games=300, not 400"):
+        main.run_sharded_control_experiment(400, 'sharded', seed=0, shard_size=100, max_workers=1)
+    with pytest.raises(ValueError, match="shard_size=100, not 150"):
+        main.run_sharded_control_experiment(300, 'sharded', seed=0, shard_size=150, max_workers=1)
+
+    main.run_sharded_control_experiment(300, 'sharded', seed=0, shard_size=100, max_workers=1)
+    assert (data_folder / 'sharded' / 'sharded_game_results.csv').read_text() == results
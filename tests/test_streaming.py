@@ -0,0 +1,59 @@
+import time
+import pytest
+from deception.environments.blackjack import Blackjack, CARDS
+from pyfiles.agent import get_streaming_draw_card_fn
+from pyfiles.fake_agent import FakeAgent
+from pyfiles.prompt import ZERO_SHOT_PROMPT
+from pyfiles.rate_limit import RateLimiter
+from pyfiles.stub_server import StubServer
+
+ChatOpenAI = pytest.importorskip('langchain_openai').ChatOpenAI
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def stub_agent(server):
+    return ChatOpenAI(model="gpt-4o", base_url=server.url, api_key="stub", max_retries=0, temperature=0)
+
+def test_stream_is_cancelled_once_the_card_is_parsed():
+    chatter = 15
+    with StubServer(seed=0, chatter=chatter, token_latency=0.02) as server:
+        draw_card = get_streaming_draw_card_fn(stub_agent(server), ZERO_SHOT_PROMPT)
+        start = time.perf_counter()
+        is_valid, card = draw_card(Blackjack(None).game_state())
+        seconds = time.perf_counter() - start
+        # The server only notices the closed connection on its next write.
+        assert wait_for(lambda: server.cancelled_streams == 1)
+
+    assert is_valid and card in CARDS
+    assert server.requests == 1
+    # The card and the word after it (which makes "1" vs "10" certain), plus
+    # at most a couple of tokens in flight when the stream was closed.
+    assert 1 <= server.streamed_tokens <= 4 < 1 + chatter
+    assert seconds < chatter * 0.02
+
+def test_throttled_stream_is_retried():
+    with StubServer(fail_first=2, retry_after=0, seed=0, chatter=5) as server:
+        rate_limiter = RateLimiter(base_delay=0.01, max_delay=0.05, seed=0)
+        draw_card = get_streaming_draw_card_fn(stub_agent(server), ZERO_SHOT_PROMPT, rate_limiter=rate_limiter)
+        is_valid, card = draw_card(Blackjack(None).game_state())
+
+    assert is_valid and card in CARDS
+    assert (server.requests, server.errors) == (3, 2)
+    stats = rate_limiter.stats()
+    assert (stats['requests'], stats['throttled'], stats['failures']) == (3, 2, 0)
+
+def test_streaming_runs_share_the_rate_limiter(data_folder):
+    import main
+    rate_limiter = RateLimiter(base_delay=0.001, max_delay=0.005, seed=0)
+    agent = FakeAgent(seed=0, error_rate=0.2, chatter=5)
+    main.run_agent_experiment(30, 'streamed', agent, ZERO_SHOT_PROMPT, stream=True, concurrency=4, rate_limiter=rate_limiter)
+
+    summary = (data_folder / 'streamed' / 'streamed_summary_stats.csv').read_text()
+    assert 'total_games,30' in summary
+    stats = rate_limiter.stats()
+    assert stats['throttled'] > 0 and stats['failures'] == 0
+    assert stats['requests'] == agent.calls
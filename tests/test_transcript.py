@@ -0,0 +1,55 @@
+import json
+import pytest
+import main
+from pyfiles.fake_agent import FakeAgent, FakeAPIError
+from pyfiles.monitors import ExperimentMonitor
+from pyfiles.prompt import ZERO_SHOT_PROMPT
+from pyfiles.rate_limit import RateLimiter
+from pyfiles.results_store import load_results
+
+class StopAfter(ExperimentMonitor):
+    def __init__(self, games):
+        self.games = games
+        self.seen = 0
+
+    def update(self, result):
+        self.seen += 1
+
+    def should_stop(self):
+        return self.seen >= self.games
+
+def game_results(data_folder, unique_str):
+    # Replays do not carry the run's own label columns (cards_per_call).
+    df = load_results(str(data_folder / unique_str / f'{unique_str}_game_results.csv'))
+    return df.drop(columns=['cards_per_call'], errors='ignore')
+
+def check_replay(data_folder, unique_str, expected_games):
+    main.run_replay_experiment(unique_str, f'{unique_str}_replay')
+    saved, replayed = game_results(data_folder, unique_str), game_results(data_folder, f'{unique_str}_replay')
+    assert len(saved) == len(replayed) == expected_games
+    assert replayed.equals(saved[replayed.columns])
+
+def test_replay_matches_the_saved_results(data_folder):
+    main.run_agent_experiment(30, 'fake', FakeAgent(seed=0, invalid_rate=0.1), ZERO_SHOT_PROMPT)
+    check_replay(data_folder, 'fake', 30)
+
+def test_replay_skips_games_dropped_by_an_early_stop(data_folder):
+    main.run_agent_experiment(40, 'stopped', FakeAgent(latency=0.001, seed=0), ZERO_SHOT_PROMPT,
+                              concurrency=8, monitors=[StopAfter(3)])
+    # Games in flight at the stop still drew cards.
+    with open(data_folder / 'stopped' / 'stopped_transcript.jsonl') as f:
+        started = {record['game'] for record in map(json.loads, f) if 'card' in record}
+    assert len(started) > 3
+    check_replay(data_folder, 'stopped', 3)
+
+def test_replay_skips_a_game_cut_off_by_a_crash(data_folder):
+    rate_limiter = RateLimiter(max_retries=0)
+    with pytest.raises(FakeAPIError):
+        main.run_agent_experiment(200, 'crashed', FakeAgent(seed=0, error_rate=0.005), ZERO_SHOT_PROMPT, rate_limiter=rate_limiter)
+    # Before resuming, only the games the run kept are replayed.
+    main.run_replay_experiment('crashed', 'crashed_partial')
+    assert 0 < len(game_results(data_folder, 'crashed_partial')) < 200
+
+    # The resumed run plays the lost games again under the same numbers.
+    main.run_agent_experiment(200, 'crashed', FakeAgent(seed=1), ZERO_SHOT_PROMPT, rate_limiter=rate_limiter)
+    check_replay(data_folder, 'crashed', 200)
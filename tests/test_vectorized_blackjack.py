@@ -0,0 +1,40 @@
+import numpy as np
+from deception.environments.blackjack import Blackjack
+from deception.environments.vectorized_blackjack import simulate_games
+from pyfiles.results_store import CARDS, CARD_INDEX, HANDS
+from pyfiles.utils import make_random_draw_card
+
+NUM_GAMES = 20000
+
+def scalar_games(num_games, seed):
+    draw_card = make_random_draw_card(seed)
+    return [Blackjack(draw_card).play() for _ in range(num_games)]
+
+def card_frequencies(hands):
+    counts = np.asarray(hands).sum(axis=0)
+    return counts / counts.sum()
+
+def value_frequencies(values, support):
+    values = np.asarray(values)
+    return np.array([np.mean(values == value) for value in support])
+
+def test_simulate_games_matches_scalar_blackjack():
+    simulation = simulate_games(NUM_GAMES, 0)
+    games = scalar_games(NUM_GAMES, 0)
+
+    for hand in HANDS:
+        scalar_counts = np.zeros((len(games), len(CARDS)))
+        for i, game in enumerate(games):
+            for card, count in game[hand].items():
+                scalar_counts[i, CARD_INDEX[card]] = count
+        assert np.abs(card_frequencies(simulation[hand]) - card_frequencies(scalar_counts)).max() < 0.01
+        assert abs(simulation[hand].sum(axis=1).mean() - scalar_counts.sum(axis=1).mean()) < 0.05
+
+    for column in ('player_hand_value', 'dealer_hand_value'):
+        scalar_values = [game[column] for game in games]
+        support = sorted(set(simulation[column].tolist()) | set(scalar_values))
+        difference = value_frequencies(simulation[column], support) - value_frequencies(scalar_values, support)
+        assert np.abs(difference).max() < 0.015, column
+
+    for column in ('player_win', 'dealer_win', 'push', 'dealer_bust'):
+        assert abs(simulation[column].mean() - np.mean([game[column] for game in games])) < 0.02, column